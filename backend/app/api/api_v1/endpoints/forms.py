@@ -92,20 +92,19 @@ async def submit_demo_request(
             'preferred_date': demo.preferred_date,
         }
         
-        logger.info("📤 Sending admin notification...")
-        admin_email_sent = email_service.send_demo_request_notification(email_data)
+        # Step 3: Admin notification and user confirmation share one SMTP connection,
+        # sent from a worker thread so the event loop keeps serving requests
+        logger.info("📤 Sending admin notification and user confirmation...")
+        admin_email_sent, user_email_sent = await email_service.send_batch_async(
+            lambda: email_service.send_demo_request_notification(email_data),
+            lambda: email_service.send_confirmation_to_user(demo.email, demo.full_name, "demo"),
+        )
         
         if admin_email_sent:
             logger.info("✅ Admin notification sent successfully")
         else:
             logger.error("❌ Failed to send admin notification")
         
-        # Step 3: Send confirmation to user
-        logger.info("📧 Step 3: Sending user confirmation...")
-        user_email_sent = email_service.send_confirmation_to_user(
-            demo.email, demo.full_name, "demo"
-        )
-        
         if user_email_sent:
             logger.info("✅ User confirmation sent successfully")
         else:
@@ -187,8 +186,10 @@ async def submit_contact_message(
             'priority': contact.priority,
         }
         
-        admin_email_sent = email_service.send_contact_message_notification(email_data)
-        user_email_sent = email_service.send_confirmation_to_user(contact.email, contact.full_name, "contact")
+        admin_email_sent, user_email_sent = await email_service.send_batch_async(
+            lambda: email_service.send_contact_message_notification(email_data),
+            lambda: email_service.send_confirmation_to_user(contact.email, contact.full_name, "contact"),
+        )
         
         logger.info(f"Admin email sent: {admin_email_sent}")
         logger.info(f"User email sent: {user_email_sent}")
@@ -233,7 +234,9 @@ async def test_email_endpoint():
     
     try:
         logger.info("📤 Sending test email...")
-        success = email_service.send_demo_request_notification(test_data)
+        (success,) = await email_service.send_batch_async(
+            lambda: email_service.send_demo_request_notification(test_data)
+        )
         
         return {
             "status": "success" if success else "failed",
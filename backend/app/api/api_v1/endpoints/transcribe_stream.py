@@ -107,7 +107,7 @@ async def transcribe_stream(
         async def process_responses():
             try:
                 # Run Google streaming_recognize in thread pool (it's synchronous)
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 responses = await loop.run_in_executor(
                     None,
                     lambda: get_speech_client().streaming_recognize(requests=audio_generator())
@@ -15,8 +15,23 @@ from cryptography.hazmat.backends import default_backend
 import secrets
 import os
 
+from passlib.context import CryptContext
+
 from .config import settings
 
+# The app's single password hashing policy (app.core.security reuses it). New hashes are
+# Argon2id at 64 MiB per hash; bcrypt hashes from before still verify and are flagged by
+# needs_update() so logins upgrade them.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=1,
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
+
 
 class FieldEncryption:
     """
@@ -111,30 +126,21 @@ class HashingUtility:
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash password using bcrypt directly."""
-        import bcrypt
-        
-        # Encode password to bytes
-        password_bytes = password.encode('utf-8')
-        
-        # Generate salt and hash
-        salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        
-        # Return as string
-        return hashed.decode('utf-8')
+        """Hash password using Argon2id (see pwd_context)."""
+        return pwd_context.hash(password)
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verify password against hash using bcrypt directly."""
-        import bcrypt
-        
-        # Encode both to bytes
-        password_bytes = plain_password.encode('utf-8')
-        hashed_bytes = hashed_password.encode('utf-8')
-        
-        # Verify
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+        """Verify password against an Argon2id or (legacy) bcrypt hash."""
+        return pwd_context.verify(plain_password, hashed_password)
+    
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """
+        Whether a stored hash should be replaced by hash_password() output.
+        True for bcrypt hashes and Argon2 hashes with outdated parameters.
+        """
+        return pwd_context.needs_update(hashed_password)
     
     @staticmethod
     def generate_secure_token(length: int = 32) -> str:
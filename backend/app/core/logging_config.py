@@ -3,12 +3,17 @@ Structured JSON logging configuration for production-ready logging.
 
 This module provides:
 - CustomJsonFormatter: Formats logs as JSON with standard fields
+- StructuredQueueHandler: Queue handler that preserves exception info for the JSON formatter
 - setup_logging: Configures application-wide logging
 - LogContext: Context manager for adding contextual information to logs
 """
 
+import atexit
+import copy
 import logging
+import logging.handlers
 import json
+import queue
 import sys
 import traceback
 from datetime import datetime
@@ -69,12 +74,31 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
             }
 
 
-def setup_logging(log_level: str = "INFO") -> logging.Logger:
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for the in-process log queue that keeps exc_info on the record.
+    
+    The stock prepare() formats the record with a plain formatter, folds the
+    traceback into msg and clears exc_info, so CustomJsonFormatter on the
+    listener thread could no longer write its structured exception field.
+    """
+    
+    def prepare(self, record):
+        # Merge args now so later mutation of the arguments cannot change the message
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_logging(log_level: str = "INFO", use_queue: bool = False) -> logging.Logger:
     """
     Configure application logging with JSON format.
     
     Args:
         log_level: Minimum log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        use_queue: Hand records to a QueueHandler and format/write them on a
+            background QueueListener thread, so request handlers never block on stdout
     
     Returns:
         Configured root logger
@@ -98,7 +122,14 @@ def setup_logging(log_level: str = "INFO") -> logging.Logger:
     
     # Remove existing handlers to avoid duplicates
     root_logger.handlers = []
-    root_logger.addHandler(handler)
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        root_logger.addHandler(StructuredQueueHandler(log_queue))
+    else:
+        root_logger.addHandler(handler)
     
     # Reduce noise from libraries
     logging.getLogger('uvicorn.access').setLevel(logging.WARNING)
@@ -14,7 +14,7 @@ import time
 import logging
 
 from .config import settings
-from .encryption import hash_util
+from .encryption import hash_util, pwd_context
 
 logger = logging.getLogger(__name__)
 
@@ -292,16 +292,7 @@ class SecurityValidator:
 # PASSWORD HASHING UTILITIES (Argon2id - Modern Standard)
 # ============================================================================
 
-from passlib.context import CryptContext
-
-# Password hashing context using Argon2id (more secure than bcrypt)
-pwd_context = CryptContext(
-    schemes=["argon2"], 
-    deprecated="auto",
-    argon2__time_cost=2,
-    argon2__memory_cost=512,
-    argon2__parallelism=2
-)
+# Password hashing context: shared with HashingUtility, defined in app.core.encryption
 
 
 def get_password_hash(password: str) -> str:
@@ -322,7 +313,7 @@ def get_password_hash(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a password against its Argon2 hash.
+    Verify a password against its Argon2 (or legacy bcrypt) hash.
     
     Args:
         plain_password: Plain text password to verify
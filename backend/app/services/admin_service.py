@@ -337,12 +337,14 @@ class AdminService:
             login_url = f"{settings.FRONTEND_URL}/auth/login" if hasattr(settings, 'FRONTEND_URL') else "http://localhost:3000/auth/login"
             
             try:
-                email_sent = email_service.send_doctor_approval_email(
-                    to_email=doctor.email,
-                    doctor_name=profile.full_name,
-                    login_email=doctor.email,
-                    temporary_password=temp_password,
-                    login_url=login_url
+                (email_sent,) = await email_service.send_batch_async(
+                    lambda: email_service.send_doctor_approval_email(
+                        to_email=doctor.email,
+                        doctor_name=profile.full_name,
+                        login_email=doctor.email,
+                        temporary_password=temp_password,
+                        login_url=login_url
+                    )
                 )
                 
                 if email_sent:
@@ -459,10 +461,12 @@ class AdminService:
             
             # Send rejection email with reason
             try:
-                email_sent = email_service.send_doctor_rejection_email(
-                    to_email=doctor.email,
-                    doctor_name=profile.full_name,
-                    rejection_reason=rejection_reason
+                (email_sent,) = await email_service.send_batch_async(
+                    lambda: email_service.send_doctor_rejection_email(
+                        to_email=doctor.email,
+                        doctor_name=profile.full_name,
+                        rejection_reason=rejection_reason
+                    )
                 )
                 
                 if email_sent:
@@ -265,22 +265,22 @@ class AuthenticationService:
                     'specialization': 'Psychiatrist',  # Default specialization
                 }
                 
-                # Send notification to admin
-                logger.info(f"[{request_id}] 📧 Sending admin notification...")
-                admin_email_sent = email_service.send_doctor_registration_notification(doctor_email_data)
+                # Admin notification and doctor confirmation share one SMTP connection,
+                # sent from a worker thread so registration doesn't block the event loop
+                logger.info(f"[{request_id}] 📧 Sending admin notification and doctor confirmation...")
+                admin_email_sent, doctor_email_sent = await email_service.send_batch_async(
+                    lambda: email_service.send_doctor_registration_notification(doctor_email_data),
+                    lambda: email_service.send_doctor_registration_confirmation(
+                        email=registration_data.email,
+                        name=registration_data.full_name
+                    ),
+                )
                 
                 if admin_email_sent:
                     logger.info(f"[{request_id}] ✅ Admin notification sent successfully")
                 else:
                     logger.error(f"[{request_id}] ❌ Failed to send admin notification")
                 
-                # Send confirmation to doctor
-                logger.info(f"[{request_id}] 📧 Sending confirmation to doctor...")
-                doctor_email_sent = email_service.send_doctor_registration_confirmation(
-                    email=registration_data.email,
-                    name=registration_data.full_name
-                )
-                
                 if doctor_email_sent:
                     logger.info(f"[{request_id}] ✅ Doctor confirmation sent successfully")
                 else:
@@ -387,6 +387,12 @@ class AuthenticationService:
                 )
             
             logger.info(f"[{request_id}] ✅ Password verified successfully")
+            
+            # Upgrade legacy bcrypt hashes to Argon2id while the plain password is at hand;
+            # saved by the last-login commit below
+            if self.hash_util.needs_rehash(user.password_hash):
+                user.password_hash = self.hash_util.hash_password(login_data.password)
+                logger.info(f"[{request_id}] Password hash upgraded for user: {user.id}")
         
             # Check doctor status if user is a doctor
             if user.role == "doctor":
@@ -2,20 +2,27 @@
 Email Service with Enhanced Debugging
 """
 
+import asyncio
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from email.message import EmailMessage
+from typing import Callable, Dict, Any, Iterator, List, Optional
 from datetime import datetime
+from pathlib import Path
 import logging
+import threading
 import traceback
 
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
 from app.core.config import settings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+EMAIL_TEMPLATES_DIR = Path(__file__).parent / "email_templates"
+
 
 class EmailService:
     def __init__(self):
@@ -26,6 +33,15 @@ class EmailService:
         self.from_email = settings.SMTP_FROM_EMAIL
         self.from_name = settings.SMTP_FROM_NAME
         self.admin_email = settings.ADMIN_EMAIL
+        # Per-thread SMTP connection opened by session(); the service is shared across requests
+        self._local = threading.local()
+        # Templates are compiled once here; auto_reload=False skips the per-render mtime check
+        self._template_env = Environment(
+            loader=FileSystemLoader(EMAIL_TEMPLATES_DIR),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+        )
+        self._approval_template = self._template_env.get_template("approval.html")
         
         # Log configuration on initialization
         logger.info("=" * 60)
@@ -47,9 +63,64 @@ class EmailService:
         if not self.admin_email:
             logger.error("❌ ADMIN_EMAIL is not set in environment variables!")
     
+    def _connect(self) -> smtplib.SMTP:
+        """Open an SMTP connection, upgrade it to TLS and log in."""
+        logger.info(f"Connecting to SMTP server: {self.smtp_host}:{self.smtp_port}")
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10)
+        logger.info("✓ Connected to SMTP server")
+        
+        # Enable debug output
+        server.set_debuglevel(1)
+        
+        # Start TLS
+        logger.info("Starting TLS...")
+        server.starttls()
+        logger.info("✓ TLS started")
+        
+        # Login
+        logger.info(f"Logging in as: {self.smtp_user}")
+        server.login(self.smtp_user, self.smtp_password)
+        logger.info("✓ Login successful")
+        return server
+    
+    @contextmanager
+    def session(self) -> Iterator[None]:
+        """
+        Send every email inside the block over one SMTP connection, paying the TCP, TLS and
+        login round-trips once instead of per message. If connecting fails, each send falls
+        back to its own connection and reports its own error as usual.
+        """
+        try:
+            server = self._connect()
+        except Exception as e:
+            logger.error(f"❌ Could not open shared SMTP connection: {str(e)}")
+            yield
+            return
+        
+        self._local.server = server
+        try:
+            yield
+        finally:
+            self._local.server = None
+            try:
+                server.quit()
+                logger.info("✓ Shared connection closed")
+            except (smtplib.SMTPException, OSError):
+                pass
+    
+    def send_batch(self, *sends: Callable[[], bool]) -> List[bool]:
+        """Run the given send calls in order over one session(); returns each call's result."""
+        with self.session():
+            return [send() for send in sends]
+    
+    async def send_batch_async(self, *sends: Callable[[], bool]) -> List[bool]:
+        """send_batch() on a worker thread, so async callers never block the event loop on SMTP."""
+        return await asyncio.to_thread(self.send_batch, *sends)
+    
     def _send_email(self, to_email: str, subject: str, html_body: str) -> bool:
         """
-        Send email with detailed error logging
+        Send email with detailed error logging. Inside session() the shared connection is used;
+        otherwise a connection is opened and closed for this message alone.
         """
         logger.info("=" * 60)
         logger.info("ATTEMPTING TO SEND EMAIL")
@@ -60,43 +131,27 @@ class EmailService:
         logger.info(f"SMTP User: {self.smtp_user}")
         
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
+            # Create message: a single text/html part, no multipart wrapper around it
+            msg = EmailMessage()
             msg['Subject'] = subject
             msg['From'] = f"{self.from_name} <{self.from_email}>"
             msg['To'] = to_email
-            
-            part = MIMEText(html_body, 'html')
-            msg.attach(part)
+            msg.set_content(html_body, subtype='html')
             
             logger.info("✓ Email message created")
             
-            # Connect to SMTP server
-            logger.info(f"Connecting to SMTP server: {self.smtp_host}:{self.smtp_port}")
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10)
-            logger.info("✓ Connected to SMTP server")
-            
-            # Enable debug output
-            server.set_debuglevel(1)
-            
-            # Start TLS
-            logger.info("Starting TLS...")
-            server.starttls()
-            logger.info("✓ TLS started")
-            
-            # Login
-            logger.info(f"Logging in as: {self.smtp_user}")
-            server.login(self.smtp_user, self.smtp_password)
-            logger.info("✓ Login successful")
+            shared = getattr(self._local, "server", None)
+            server = shared if shared is not None else self._connect()
             
             # Send email
             logger.info("Sending email...")
             server.send_message(msg)
             logger.info("✓ Email sent")
             
-            # Close connection
-            server.quit()
-            logger.info("✓ Connection closed")
+            # Close connection unless session() owns it
+            if shared is None:
+                server.quit()
+                logger.info("✓ Connection closed")
             
             logger.info("=" * 60)
             logger.info(f"✅ EMAIL SENT SUCCESSFULLY TO {to_email}")
@@ -104,6 +159,7 @@ class EmailService:
             return True
             
         except smtplib.SMTPAuthenticationError as e:
+            self._local.server = None  # Later sends in a session() reconnect on their own
             logger.error("=" * 60)
             logger.error("❌ SMTP AUTHENTICATION ERROR")
             logger.error("=" * 60)
@@ -118,6 +174,7 @@ class EmailService:
             return False
             
         except smtplib.SMTPException as e:
+            self._local.server = None
             logger.error("=" * 60)
             logger.error("❌ SMTP ERROR")
             logger.error("=" * 60)
@@ -127,6 +184,7 @@ class EmailService:
             return False
             
         except Exception as e:
+            self._local.server = None
             logger.error("=" * 60)
             logger.error("❌ UNEXPECTED ERROR")
             logger.error("=" * 60)
@@ -528,190 +586,13 @@ class EmailService:
         
         subject = "🎉 Your SynapseAI Doctor Account Has Been Approved"
         
-        html_body = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; color: #333; line-height: 1.6; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ 
-                    background: linear-gradient(135deg, #10B981, #059669); 
-                    color: white; 
-                    padding: 40px; 
-                    text-align: center; 
-                    border-radius: 8px 8px 0 0; 
-                }}
-                .content {{ 
-                    background: #f9f9f9; 
-                    padding: 30px; 
-                    border-radius: 0 0 8px 8px; 
-                }}
-                .credentials-box {{
-                    background: white;
-                    border: 2px solid #10B981;
-                    padding: 20px;
-                    border-radius: 8px;
-                    margin: 20px 0;
-                }}
-                .credential-item {{
-                    margin: 10px 0;
-                    padding: 10px;
-                    background: #F0FDF4;
-                    border-radius: 4px;
-                }}
-                .credential-label {{
-                    font-weight: bold;
-                    color: #059669;
-                    display: block;
-                    margin-bottom: 5px;
-                }}
-                .credential-value {{
-                    font-family: 'Courier New', monospace;
-                    font-size: 16px;
-                    color: #1F2937;
-                    background: white;
-                    padding: 8px;
-                    border-radius: 4px;
-                    border: 1px solid #D1FAE5;
-                }}
-                .warning-box {{
-                    background: #FEF3C7;
-                    border-left: 4px solid #F59E0B;
-                    padding: 15px;
-                    margin: 20px 0;
-                    border-radius: 4px;
-                }}
-                .login-button {{
-                    display: inline-block;
-                    padding: 15px 30px;
-                    background: #10B981;
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 8px;
-                    font-weight: bold;
-                    text-align: center;
-                    margin: 20px 0;
-                }}
-                .steps {{
-                    background: white;
-                    padding: 20px;
-                    border-radius: 8px;
-                    margin: 20px 0;
-                }}
-                .step {{
-                    display: flex;
-                    gap: 15px;
-                    margin-bottom: 15px;
-                    align-items: flex-start;
-                }}
-                .step-number {{
-                    background: #10B981;
-                    color: white;
-                    width: 30px;
-                    height: 30px;
-                    border-radius: 50%;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    font-weight: bold;
-                    flex-shrink: 0;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1 style="margin: 0; font-size: 28px;">🎉 Congratulations!</h1>
-                    <p style="margin: 10px 0 0 0; opacity: 0.95; font-size: 16px;">Your Application Has Been Approved</p>
-                </div>
-                <div class="content">
-                    <p><strong>Dear Dr. {doctor_name},</strong></p>
-                    
-                    <p>Congratulations! We're thrilled to inform you that your SynapseAI doctor account has been <strong>approved and activated</strong>.</p>
-                    
-                    <p>You can now access your account using the credentials below:</p>
-                    
-                    <div class="credentials-box">
-                        <h3 style="color: #059669; margin-top: 0;">🔐 Your Login Credentials</h3>
-                        
-                        <div class="credential-item">
-                            <span class="credential-label">Email:</span>
-                            <div class="credential-value">{login_email}</div>
-                        </div>
-                        
-                        <div class="credential-item">
-                            <span class="credential-label">Temporary Password:</span>
-                            <div class="credential-value">{temporary_password}</div>
-                        </div>
-                    </div>
-                    
-                    <div class="warning-box">
-                        <strong>⚠️ Important Security Notice:</strong><br>
-                        For your security, you will be required to <strong>change your password immediately</strong> upon first login. Please choose a strong password.
-                    </div>
-                    
-                    <div class="steps">
-                        <h3 style="color: #059669; margin-top: 0;">📋 Next Steps:</h3>
-                        
-                        <div class="step">
-                            <div class="step-number">1</div>
-                            <div>
-                                <strong>Login to Your Account</strong><br>
-                                Click the button below to access your dashboard
-                            </div>
-                        </div>
-                        
-                        <div class="step">
-                            <div class="step-number">2</div>
-                            <div>
-                                <strong>Change Your Password</strong><br>
-                                You'll be prompted to create a new secure password
-                            </div>
-                        </div>
-                        
-                        <div class="step">
-                            <div class="step-number">3</div>
-                            <div>
-                                <strong>Complete Your Profile</strong><br>
-                                Add additional details and preferences
-                            </div>
-                        </div>
-                        
-                        <div class="step">
-                            <div class="step-number">4</div>
-                            <div>
-                                <strong>Start Using SynapseAI</strong><br>
-                                Begin managing consultations and patient care
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{login_url}" class="login-button">
-                            🚀 Login to Your Dashboard
-                        </a>
-                    </div>
-                    
-                    <p style="margin-top: 30px; padding: 20px; background: #E3F4FC; border-radius: 8px;">
-                        <strong>💡 Pro Tip:</strong> Save your temporary password securely until you complete your first login and password change.
-                    </p>
-                    
-                    <p style="margin-top: 30px; font-size: 14px; color: #666;">
-                        <strong>Need Help?</strong><br>
-                        If you have any questions or need assistance, contact us at <a href="mailto:{self.admin_email}">{self.admin_email}</a>
-                    </p>
-                    
-                    <p style="margin-top: 30px;">
-                    Welcome to the SynapseAI family!<br>
-                    <strong>The SynapseAI Team</strong><br>
-                    <em>Effortless Intelligence, Absolute Security</em>
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        html_body = self._approval_template.render(
+            doctor_name=doctor_name,
+            login_email=login_email,
+            temporary_password=temporary_password,
+            login_url=login_url,
+            admin_email=self.admin_email,
+        )
         
         return self._send_email(to_email, subject, html_body)
     
@@ -15,6 +15,34 @@ import google.generativeai as genai
 
 logger = logging.getLogger(__name__)
 
+# ✅ Safety settings for medical content - MOST PERMISSIVE
+# Using list format (recommended by Google) instead of dict
+MEDICAL_SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"}
+]
+
+REPORT_GENERATION_CONFIG = {
+    "temperature": 0.3,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 2048,
+    "response_mime_type": "application/json"
+}
+
+TRANSLATION_GENERATION_CONFIG = {"temperature": 0.1, "max_output_tokens": 2048}
+
+# Optional GEMINI_TRANSPORT override. Only gRPC transports are allowed: simple_main awaits
+# generate_content_async, which the "rest" transport cannot serve.
+GEMINI_TRANSPORTS = ("grpc", "grpc_asyncio")
+GEMINI_TRANSPORT = os.getenv("GEMINI_TRANSPORT") or None
+if GEMINI_TRANSPORT is not None and GEMINI_TRANSPORT not in GEMINI_TRANSPORTS:
+    raise ValueError(
+        f"GEMINI_TRANSPORT must be one of {', '.join(GEMINI_TRANSPORTS)} (or unset), got {GEMINI_TRANSPORT!r}"
+    )
+
 class GeminiService:
     """Service for AI-powered mental health reports using service account credentials."""
     
@@ -38,11 +66,26 @@ class GeminiService:
                 self.model_name = "gemini-2.5-flash"
                 self.credentials = credentials
                 
-                # Configure Gemini API with access token
-                genai.configure(credentials=credentials)
+                # Configure Gemini API with access token. The SDK keeps one client
+                # (and its gRPC channel / HTTP session) per process, so every model
+                # below shares the same persistent connection.
+                genai.configure(
+                    credentials=credentials,
+                    transport=GEMINI_TRANSPORT
+                )
                 
-                # Initialize Gemini model
+                # Initialize Gemini models once instead of per call
                 self.model = genai.GenerativeModel(self.model_name)
+                self.report_model = genai.GenerativeModel(
+                    self.model_name,
+                    generation_config=REPORT_GENERATION_CONFIG,
+                    safety_settings=MEDICAL_SAFETY_SETTINGS
+                )
+                self.translation_model = genai.GenerativeModel(
+                    self.model_name,
+                    generation_config=TRANSLATION_GENERATION_CONFIG,
+                    safety_settings=MEDICAL_SAFETY_SETTINGS
+                )
                 
                 logger.info("✅ Gemini 2.5 Flash initialized successfully (Mumbai region)")
             else:
@@ -79,44 +122,7 @@ class GeminiService:
 
             
             # Call real Gemini 2.5 Flash API with JSON response format
-            generation_config = {
-                "temperature": 0.3,
-                "top_p": 0.95,
-                "top_k": 40,
-                "max_output_tokens": 2048,
-                "response_mime_type": "application/json"
-            }
-            
-            # ✅ Configure safety settings for medical content - MOST PERMISSIVE
-            # Using list format (recommended by Google) instead of dict
-            safety_settings = [
-                {
-                    "category": "HARM_CATEGORY_HARASSMENT",
-                    "threshold": "BLOCK_NONE"
-                },
-                {
-                    "category": "HARM_CATEGORY_HATE_SPEECH",
-                    "threshold": "BLOCK_NONE"
-                },
-                {
-                    "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                    "threshold": "BLOCK_NONE"
-                },
-                {
-                    "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                    "threshold": "BLOCK_NONE"
-                }
-            ]
-            
-            logger.info("🛡️ Safety settings configured: BLOCK_NONE for all categories (medical use case)")
-            
-            model_with_config = genai.GenerativeModel(
-                self.model_name,
-                generation_config=generation_config,
-                safety_settings=safety_settings
-            )
-            
-            response = model_with_config.generate_content(prompt)
+            response = self.report_model.generate_content(prompt)
             
             # ✅ Check if response was blocked by safety filters
             logger.info(f"📊 Response candidates count: {len(response.candidates) if response.candidates else 0}")
@@ -405,18 +411,7 @@ RESPOND WITH ONLY THE ENGLISH TRANSLATION, NO EXPLANATIONS.
 """
             
             # Use simple model without JSON mode for translation
-            simple_model = genai.GenerativeModel(
-                self.model_name,
-                generation_config={"temperature": 0.1, "max_output_tokens": 2048},
-                safety_settings=[
-                    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"}
-                ]
-            )
-            
-            translation_response = simple_model.generate_content(translation_prompt)
+            translation_response = self.translation_model.generate_content(translation_prompt)
             
             if translation_response.candidates and translation_response.candidates[0].content.parts:
                 translated = translation_response.text.strip()
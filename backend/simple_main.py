@@ -5,11 +5,19 @@ ENHANCED: Structured JSON logging with request tracking
 """
 
 import asyncio
+import contextlib
+import functools
+import gzip
+import hashlib
+import heapq
 import json
 import os
+import sqlite3
 import threading
-import queue
+import random
 import time
+import uuid
+from collections import deque
 from datetime import datetime, timezone
 import numpy as np
 from google.cloud import speech
@@ -17,10 +25,12 @@ from google.oauth2 import service_account
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Header, Response
 import re
 from fastapi import Request, Depends
+from fastapi.responses import ORJSONResponse
 from fastapi.websockets import WebSocketState
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
+from cachetools import TTLCache
 
 # Import REAL JWT manager from production backend
 from app.core.security import JWTManager
@@ -36,12 +46,27 @@ from app.core.rate_limit import limiter, rate_limit_handler, RateLimitExceeded
 load_dotenv()
 
 # Setup structured logging FIRST (before any other initialization)
-logger = setup_logging(log_level=os.getenv("LOG_LEVEL", "INFO"))
+logger = setup_logging(log_level=os.getenv("LOG_LEVEL", "INFO"), use_queue=True)
 logger.info("Application starting up", extra={'environment': os.getenv('ENVIRONMENT', 'development')})
 
 # Initialize JWT manager for REAL token generation
 jwt_manager = JWTManager()
 
+# Access-token payloads that already passed verify_token, so reconnecting WebSockets and
+# repeated requests skip the signature check; a hit is still rejected once its "exp" passes.
+_VERIFIED_ACCESS_TOKENS: TTLCache = TTLCache(maxsize=1024, ttl=300)
+_VERIFIED_ACCESS_TOKENS_LOCK = threading.Lock()
+
+def _verify_access_token(token: str) -> dict:
+    with _VERIFIED_ACCESS_TOKENS_LOCK:
+        payload = _VERIFIED_ACCESS_TOKENS.get(token)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    payload = jwt_manager.verify_token(token, token_type="access")
+    with _VERIFIED_ACCESS_TOKENS_LOCK:
+        _VERIFIED_ACCESS_TOKENS[token] = payload
+    return payload
+
 # Initialize Google Cloud Speech client with proper path
 # Use relative path that works in both development and Docker container
 credentials_path = "gcp-credentials.json"
@@ -69,10 +94,114 @@ except Exception as e:
     print("Will use mock transcription as fallback")
     speech_client = None
 
+# Mental health specific terms for enhanced recognition
+_MENTAL_HEALTH_PHRASES_RAW = (
+    "anxiety", "depression", "stress", "panic", "therapy", "counseling", "medication",
+    "mood", "sleep", "insomnia", "worry", "fear", "trauma", "PTSD", "bipolar",
+    "mindfulness", "meditation", "cognitive behavioral therapy", "CBT", "psychotherapy",
+    "mental health", "psychiatric", "antidepressant", "anxiolytic", "mood stabilizer",
+    "चिंता", "तणाव", "उदासीनता", "मानसिक आरोग्य", "थेरपी", "औषध",
+    "झोप", "घबराट", "मूड", "मन", "भावना", "चिकित्सा"
+)
+
+def _dedupe_phrases(phrases) -> tuple[str, ...]:
+    """Trimmed phrases, deduplicated case-insensitively; the first spelling wins."""
+    unique: dict[str, str] = {}
+    for phrase in phrases:
+        phrase = phrase.strip()
+        if phrase:
+            unique.setdefault(phrase.casefold(), phrase)
+    return tuple(unique.values())
+
+# Each phrase is sent to SpeechContext once, so it is boosted once
+MENTAL_HEALTH_PHRASES = _dedupe_phrases(_MENTAL_HEALTH_PHRASES_RAW)
+
+# Streaming recognition config for mental health (Hindi/Marathi/English), shared by every
+# consultation session; treat as read-only and build a fresh config for any per-session override
+STT_CONFIG = speech.RecognitionConfig(
+    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+    sample_rate_hertz=16000,
+    language_code="mr-IN",  # Primary: Marathi (India)
+    alternative_language_codes=["en-IN", "hi-IN"],  # English (India), Hindi (India)
+    model="latest_long",  # Best for long-form medical conversations
+    use_enhanced=True,  # Enhanced model for better accuracy
+    enable_automatic_punctuation=True,  # Medical transcription needs punctuation
+    enable_word_confidence=True,  # Track confidence for medical accuracy
+    # Mental health speech contexts
+    speech_contexts=[
+        speech.SpeechContext(
+            phrases=MENTAL_HEALTH_PHRASES,
+            boost=15.0  # Boost mental health terminology
+        )
+    ]
+)
+
+STT_STREAMING_CONFIG = speech.StreamingRecognitionConfig(
+    config=STT_CONFIG,
+    interim_results=True,
+    single_utterance=False
+)
+
+# 50ms of 16kHz 16-bit PCM silence, sent as a keepalive between audio chunks. gRPC only
+# serializes outgoing requests, so the same message is safe to yield repeatedly.
+SILENCE_50MS = bytes(1600)
+SILENCE_REQUEST = speech.StreamingRecognizeRequest(audio_content=SILENCE_50MS)
+
+# Coalesce small frontend chunks into ~100ms frames (16kHz 16-bit) before sending to STT;
+# a partial frame is flushed once the first chunk has waited STT_FRAME_MAX_DELAY seconds
+STT_FRAME_MIN_BYTES = 3200
+STT_FRAME_MAX_BYTES = 6400
+STT_FRAME_MAX_DELAY = 0.02
+
+# Frames (~100ms each) /ws/transcribe buffers for its speech thread; past this the oldest
+# frame is dropped so a stalled stream cannot build up unbounded memory and latency
+STT_AUDIO_QUEUE_MAX_FRAMES = 100
+
+# /ws/transcribe retries failed Speech streams after a jittered delay that doubles per
+# consecutive failure, starting over once a stream produces a response again
+STT_RETRY_BACKOFF_MIN = 0.25
+STT_RETRY_BACKOFF_MAX = 8.0
+
+# /ws/transcribe sends 50ms of silence after this long without audio, so a paused session
+# keeps its Speech stream instead of timing out and reconnecting
+STT_TRANSCRIBE_KEEPALIVE_SECONDS = 10.0
+
+# Streaming sessions log one throughput summary per interval instead of per-chunk milestones
+STT_STATS_LOG_INTERVAL = 10.0
+
+# Opt-in silence skipping for /ws/consultation: frontend chunks whose RMS falls below this
+# (16-bit PCM units; 200 is about -44 dBFS) stop being forwarded once more than
+# STT_SILENCE_HANGOVER_CHUNKS of them arrive in a row, so soft speech and pauses inside words
+# still reach STT. The last skipped chunk is sent ahead of the next loud one to keep its onset;
+# the request generator's keepalive silence covers the gap. 0 (the default) disables skipping.
+STT_SILENCE_RMS_THRESHOLD = float(os.getenv("STT_SILENCE_RMS_THRESHOLD", "0"))
+STT_SILENCE_HANGOVER_CHUNKS = int(os.getenv("STT_SILENCE_HANGOVER_CHUNKS", "10"))
+
+def _is_silent_pcm(chunk: bytes) -> bool:
+    """True if 16-bit little-endian PCM `chunk` is quieter than STT_SILENCE_RMS_THRESHOLD."""
+    samples = np.frombuffer(chunk, dtype="<i2", count=len(chunk) // 2).astype(np.float32)
+    return samples.size == 0 or float(np.sqrt(np.mean(samples * samples))) < STT_SILENCE_RMS_THRESHOLD
+
+# Interim STT results arrive in bursts; their timestamps share one ISO string per 50ms tick
+_ISO_TICK_SECONDS = 0.05
+_iso_tick: tuple[float, str] = (float("-inf"), "")
+
+def _utc_now_iso() -> str:
+    """datetime.now(timezone.utc).isoformat(), reused for up to _ISO_TICK_SECONDS."""
+    global _iso_tick
+    now = time.monotonic()
+    tick_mono, tick_iso = _iso_tick
+    if now - tick_mono > _ISO_TICK_SECONDS:
+        tick_iso = datetime.now(timezone.utc).isoformat()
+        _iso_tick = (now, tick_iso)
+    return tick_iso
+
 app = FastAPI(
     title="Intelligent EMR System",
     description="Healthcare Management System with AI Integration",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson (already a requirement) encodes every dict/list response body
+    default_response_class=ORJSONResponse
 )
 
 # Add rate limiter to app state
@@ -99,42 +228,76 @@ class LoginRequest(BaseModel):
     email: str
     password: str
 
-class LoginResponse(BaseModel):
-    access_token: str
-    token_type: str
-    user: dict
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps_text(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    def _json_dumps_sorted(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+    def _static_json(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_text(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    def _json_dumps_sorted(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=True).encode()
+
+    def _static_json(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+# The health and mock endpoints return constant payloads; each is serialized once at import
+# with _static_json, so responses send the same compact bytes without re-encoding
+_ROOT_BODY = _static_json({"message": "Intelligent EMR System is running!", "status": "healthy"})
 
 @app.get("/")
 async def root():
-    return {"message": "Intelligent EMR System is running!", "status": "healthy"}
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+_HEALTH_BODY = _static_json({"status": "healthy", "service": "EMR Backend"})
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "EMR Backend"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+_API_HEALTH_BODY = _static_json({"status": "healthy", "service": "EMR API v1"})
 
 @app.get("/api/v1/health")
 async def api_health_check():
-    return {"status": "healthy", "service": "EMR API v1"}
+    return Response(content=_API_HEALTH_BODY, media_type="application/json")
+
+@functools.lru_cache(maxsize=1)
+def _get_login_session_factory():
+    """
+    sessionmaker for login's sync user lookups. One engine (and connection pool) serves every
+    login, built on first use so DATABASE_URL only has to be set by then.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    
+    sync_db_url = os.environ.get("DATABASE_URL", "").replace("+asyncpg", "")
+    return sessionmaker(bind=create_engine(sync_db_url))
 
 @app.post("/api/v1/auth/login")
 @limiter.limit("5/minute")  # Rate limit: 5 login attempts per minute per IP
-async def login(request: Request, response: Response, login_data: LoginRequest):
+def login(request: Request, response: Response, login_data: LoginRequest):
     """
     Database-backed authentication with real JWT tokens.
-    Uses direct database queries for simplicity in simple_main.py
+    Uses direct database queries for simplicity in simple_main.py; a plain def so the
+    blocking query and password hash run in the threadpool, not on the event loop.
     
     Rate Limited: 5 attempts per minute per IP address to prevent brute force attacks.
     """
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import sessionmaker
     from app.models.user import User
-    from app.core.encryption import HashingUtility
+    from app.core.encryption import hash_util
     
-    # Create sync engine
-    sync_db_url = os.environ.get("DATABASE_URL", "").replace("+asyncpg", "")
-    engine = create_engine(sync_db_url)
-    SessionLocal = sessionmaker(bind=engine)
-    db = SessionLocal()
+    db = _get_login_session_factory()()
     
     try:
         # Generate email hash
@@ -148,7 +311,6 @@ async def login(request: Request, response: Response, login_data: LoginRequest):
             raise HTTPException(status_code=401, detail="Invalid credentials")
         
         # Verify password
-        hash_util = HashingUtility()
         if not hash_util.verify_password(login_data.password, user.password_hash):
             print(f"❌ Invalid password for: {login_data.email}")
             raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -158,6 +320,11 @@ async def login(request: Request, response: Response, login_data: LoginRequest):
             print(f"❌ User not verified or active: {login_data.email}")
             raise HTTPException(status_code=403, detail="Account not active")
         
+        # Upgrade legacy bcrypt hashes to Argon2id while the plain password is at hand
+        if hash_util.needs_rehash(user.password_hash):
+            user.password_hash = hash_util.hash_password(login_data.password)
+            db.commit()
+        
         # Generate JWT tokens
         access_token = jwt_manager.create_access_token(
             data={"sub": user.id, "email": login_data.email, "role": user.role}
@@ -192,18 +359,20 @@ async def login(request: Request, response: Response, login_data: LoginRequest):
     finally:
         db.close()
 
-@app.get("/api/v1/users/me")
-async def get_current_user():
-    """Mock current user endpoint."""
-    return {
-        "status": "success",
-        "data": {
+_CURRENT_USER_BODY = _static_json({
+    "status": "success",
+    "data": {
         "id": "demo-user-id",
-        "email": "doctor@demo.com", 
+        "email": "doctor@demo.com",
         "role": "doctor",
         "name": "Dr. Smith"
-        }
     }
+})
+
+@app.get("/api/v1/users/me")
+async def get_current_user():
+    """Mock current user endpoint."""
+    return Response(content=_CURRENT_USER_BODY, media_type="application/json")
 
 # ---------------------------------------------------------------------------
 # Helper: Get current user from Authorization header (Bearer token)
@@ -219,55 +388,60 @@ def get_current_user_from_request(request: Request) -> CurrentUser:
         return CurrentUser(id="user-doctor-1", email="doctor@demo.com")
     token = auth_header.split(' ', 1)[1]
     try:
-        payload = jwt_manager.verify_token(token, token_type="access")
+        payload = _verify_access_token(token)
         return CurrentUser(id=payload.get("sub", "user-doctor-1"), email=payload.get("email", "doctor@demo.com"))
     except Exception:
         # Fallback to demo
         return CurrentUser(id="user-doctor-1", email="doctor@demo.com")
 
+_USER_PROFILE_BODY = _static_json({
+    "status": "success",
+    "data": {
+        "id": "demo-user-id",
+        "first_name": "Dr.",
+        "last_name": "Smith",
+        "email": "doctor@demo.com",
+        "phone": "+1-555-0123",
+        "specialization": "General Medicine",
+        "license_number": "MD123456",
+        "department": "Internal Medicine",
+        "role": "doctor",
+        "is_verified": True,
+        "is_active": True,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z"
+    }
+})
+
 @app.get("/api/v1/users/profile")
 async def get_user_profile():
     """Mock user profile endpoint that frontend calls after login."""
-    return {
-        "status": "success",
-        "data": {
-            "id": "demo-user-id",
-            "first_name": "Dr.",
-            "last_name": "Smith",
-            "email": "doctor@demo.com",
-            "phone": "+1-555-0123",
-            "specialization": "General Medicine",
-            "license_number": "MD123456",
-            "department": "Internal Medicine",
-            "role": "doctor",
-            "is_verified": True,
-            "is_active": True,
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
+    return Response(content=_USER_PROFILE_BODY, media_type="application/json")
+
+_VALIDATE_TOKEN_BODY = _static_json({
+    "status": "success",
+    "data": {
+        "valid": True,
+        "user_id": "demo-user-id",
+        "role": "doctor",
+        "email": "doctor@demo.com"
     }
+})
 
 @app.get("/api/v1/auth/validate-token")
 async def validate_token():
     """Mock token validation endpoint."""
-    return {
-        "status": "success",
-        "data": {
-            "valid": True,
-            "user_id": "demo-user-id",
-            "role": "doctor",
-            "email": "doctor@demo.com"
-        }
-    }
+    return Response(content=_VALIDATE_TOKEN_BODY, media_type="application/json")
 
 @app.post("/api/v1/patients/create")
 async def create_patient(patient_data: dict):
     """Mock patient creation endpoint."""
+    digest = _content_digest(patient_data)  # Same payload, same ids, in every worker
     return {
         "status": "success",
         "data": {
-            "id": f"patient-{len(str(patient_data))}",
-            "patient_id": f"PAT-{hash(str(patient_data)) % 10000:04d}",
+            "id": f"patient-{digest}",
+            "patient_id": f"PAT-{int(digest, 16) % 10000:04d}",
             "first_name": patient_data.get("first_name"),
             "last_name": patient_data.get("last_name"),
             "email": patient_data.get("email"),
@@ -277,43 +451,73 @@ async def create_patient(patient_data: dict):
         "message": "Patient registered successfully"
     }
 
-@app.get("/api/v1/patients/list/")  
-async def list_patients():
-    """Mock patient list endpoint."""
-    return {
-        "status": "success",
-        "data": {
-            "patients": [
-                {
-                    "id": "patient-1",
-                    "patient_id": "PAT-0001",
-                    "full_name": "John Doe",
-                    "age": 35,
-                    "gender": "male",
-                    "phone_primary": "+1-555-1234",
-                    "last_visit": None,
-                    "created_at": "2024-01-01T00:00:00Z"
-                },
-                {
-                    "id": "patient-2", 
-                    "patient_id": "PAT-0002",
-                    "full_name": "Jane Smith",
-                    "age": 28,
-                    "gender": "female", 
-                    "phone_primary": "+1-555-5678",
-                    "last_visit": "2024-01-15T10:00:00Z",
-                    "created_at": "2023-12-15T00:00:00Z"
-                }
-            ],
-            "total_count": 2,
-            "limit": 50,
-            "offset": 0
-        }
+_PATIENT_LIST_BODY = _static_json({
+    "status": "success",
+    "data": {
+        "patients": [
+            {
+                "id": "patient-1",
+                "patient_id": "PAT-0001",
+                "full_name": "John Doe",
+                "age": 35,
+                "gender": "male",
+                "phone_primary": "+1-555-1234",
+                "last_visit": None,
+                "created_at": "2024-01-01T00:00:00Z"
+            },
+            {
+                "id": "patient-2", 
+                "patient_id": "PAT-0002",
+                "full_name": "Jane Smith",
+                "age": 28,
+                "gender": "female", 
+                "phone_primary": "+1-555-5678",
+                "last_visit": "2024-01-15T10:00:00Z",
+                "created_at": "2023-12-15T00:00:00Z"
+            }
+        ],
+        "total_count": 2,
+        "limit": 50,
+        "offset": 0
     }
+})
+# Compressed once here instead of on every request
+_PATIENT_LIST_BODY_GZ = gzip.compress(_PATIENT_LIST_BODY, compresslevel=6)
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip: listed (or covered by "*") with q > 0."""
+    wildcard_q = None
+    for token in accept_encoding.split(","):
+        coding, *params = token.split(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            wildcard_q = q
+    return wildcard_q is not None and wildcard_q > 0
 
-@app.post("/api/v1/auth/mfa/setup")
-async def setup_mfa():
-    """Mock MFA setup endpoint."""
+@app.get("/api/v1/patients/list/")  
+async def list_patients(request: Request):
+    """Mock patient list endpoint. Sends the gzipped body to clients that accept it."""
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return Response(
+            content=_PATIENT_LIST_BODY_GZ,
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return Response(content=_PATIENT_LIST_BODY, media_type="application/json",
+                    headers={"Vary": "Accept-Encoding"})
+
+def _mfa_qr_data_url() -> str:
+    """PNG data URL of the QR code for the demo otpauth URI."""
     import base64
     
     # Create a real QR code for demo
@@ -329,17 +533,22 @@ async def setup_mfa():
         img = qr.make_image(fill_color="black", back_color="white")
         img_buffer = io.BytesIO()
         img.save(img_buffer, format='PNG')
-        img_buffer.seek(0)
         qr_code_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-        qr_data_url = f"data:image/png;base64,{qr_code_base64}"
+        return f"data:image/png;base64,{qr_code_base64}"
     except ImportError:
         # Fallback if qrcode not available
-        qr_data_url = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-    
-    return {
+        return "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+@functools.lru_cache(maxsize=1)
+def _mfa_setup_body() -> bytes:
+    """
+    Serialized MFA setup response. Nothing in it varies, so the QR code is rendered and the
+    body encoded on the first setup call only; later calls return the same bytes.
+    """
+    return _static_json({
         "status": "success",
         "data": {
-            "qr_code": qr_data_url,
+            "qr_code": _mfa_qr_data_url(),
             "secret": "JBSWY3DPEHPK3PXP",
             "backup_codes": [
                 "BACKUP01", "BACKUP02", "BACKUP03", "BACKUP04", "BACKUP05",
@@ -347,108 +556,127 @@ async def setup_mfa():
             ],
             "instructions": "Scan the QR code with your authenticator app (Google Authenticator, Authy, etc.) and verify with a 6-digit code."
         }
+    })
+
+@app.post("/api/v1/auth/mfa/setup")
+def setup_mfa():
+    """Mock MFA setup endpoint. Sync, so the first call's QR render runs in the threadpool."""
+    return Response(content=_mfa_setup_body(), media_type="application/json")
+
+_MFA_VERIFY_SETUP_BODY = _static_json({
+    "status": "success",
+    "data": {
+        "mfa_enabled": True,
+        "message": "MFA has been successfully enabled for your account"
     }
+})
 
 @app.post("/api/v1/auth/mfa/verify-setup")
 async def verify_mfa_setup(request_data: dict):
     """Mock MFA verification endpoint."""
-    return {
-        "status": "success", 
-        "data": {
-            "mfa_enabled": True,
-            "message": "MFA has been successfully enabled for your account"
-        }
+    return Response(content=_MFA_VERIFY_SETUP_BODY, media_type="application/json")
+
+_MFA_DISABLE_BODY = _static_json({
+    "status": "success",
+    "data": {
+        "mfa_disabled": True,
+        "message": "MFA has been disabled for your account"
     }
+})
 
 @app.post("/api/v1/auth/mfa/disable")
 async def disable_mfa():
     """Mock MFA disable endpoint."""
-    return {
-        "status": "success",
-        "data": {
-            "mfa_disabled": True,
-            "message": "MFA has been disabled for your account"
-        }
+    return Response(content=_MFA_DISABLE_BODY, media_type="application/json")
+
+# The two mock patients' detail payloads are fixed; serialize each once
+_PATIENT_1_DETAILS_BODY = _static_json({
+    "status": "success",
+    "data": {
+        "id": "patient-1",
+        "patient_id": "PAT-0001",
+        "full_name": "John Doe",
+        "age": 35,
+        "gender": "male",
+        "phone_primary": "+1-555-1234",
+        "email": "john.doe@email.com",
+        "address": "123 Main St, City, State 12345",
+        "emergency_contact": "Mary Doe (+1-555-9999)",
+        "blood_group": "O+",
+        "allergies": "Penicillin, Peanuts",
+        "medical_history": "Hypertension, Diabetes Type 2",
+        "created_at": "2024-01-01T00:00:00Z",
+        "last_visit": None
     }
+})
+
+_PATIENT_2_DETAILS_BODY = _static_json({
+    "status": "success",
+    "data": {
+        "id": "patient-2",
+        "patient_id": "PAT-0002",
+        "full_name": "Jane Smith",
+        "age": 28,
+        "gender": "female",
+        "phone_primary": "+1-555-5678",
+        "email": "jane.smith@email.com",
+        "address": "456 Oak Ave, City, State 67890",
+        "emergency_contact": "Bob Smith (+1-555-8888)",
+        "blood_group": "A+",
+        "allergies": "None known",
+        "medical_history": "Asthma",
+        "created_at": "2023-12-15T00:00:00Z",
+        "last_visit": "2024-01-15T10:00:00Z"
+    }
+})
+
+# Any id other than patient-1 gets patient-2's details
+_PATIENT_DETAILS_BODIES = {"patient-1": _PATIENT_1_DETAILS_BODY}
 
 @app.get("/api/v1/patients/{patient_id}")
 async def get_patient_details(patient_id: str):
     """Mock patient details endpoint."""
-    if patient_id == "patient-1":
-        return {
-            "status": "success",
-            "data": {
-                "id": "patient-1",
-                "patient_id": "PAT-0001",
-                "full_name": "John Doe",
-                "age": 35,
-                "gender": "male",
-                "phone_primary": "+1-555-1234",
-                "email": "john.doe@email.com",
-                "address": "123 Main St, City, State 12345",
-                "emergency_contact": "Mary Doe (+1-555-9999)",
-                "blood_group": "O+",
-                "allergies": "Penicillin, Peanuts",
-                "medical_history": "Hypertension, Diabetes Type 2",
-                "created_at": "2024-01-01T00:00:00Z",
-                "last_visit": None
-            }
-        }
-    else:
-        return {
-            "status": "success", 
-            "data": {
-                "id": "patient-2",
-                "patient_id": "PAT-0002",
-                "full_name": "Jane Smith",
-                "age": 28,
-                "gender": "female",
-                "phone_primary": "+1-555-5678",
-                "email": "jane.smith@email.com",
-                "address": "456 Oak Ave, City, State 67890",
-                "emergency_contact": "Bob Smith (+1-555-8888)",
-                "blood_group": "A+",
-                "allergies": "None known",
-                "medical_history": "Asthma",
-                "created_at": "2023-12-15T00:00:00Z",
-                "last_visit": "2024-01-15T10:00:00Z"
-            }
-        }
+    body = _PATIENT_DETAILS_BODIES.get(patient_id, _PATIENT_2_DETAILS_BODY)
+    return Response(content=body, media_type="application/json")
 
 @app.post("/api/v1/consultation/start")
 async def start_consultation_session(session_data: dict):
     """Mock consultation session start endpoint."""
+    # Sessions need unique ids even when the request body repeats, so no content hash here
+    session_id = f"CS-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8]}"
     return {
         "status": "success",
         "data": {
-            "session_id": "CS-2024-NEW",
+            "session_id": session_id,
             "patient_id": session_data.get("patient_id"),
             "doctor_id": session_data.get("doctor_id"), 
             "status": "in_progress",
             "started_at": "2024-01-01T00:00:00Z",
             "chief_complaint": session_data.get("chief_complaint"),
-            "recording_url": "ws://localhost:8000/ws/consultation/CS-2024-NEW"
+            "recording_url": f"ws://localhost:8000/ws/consultation/{session_id}"
         }
     }
 
+# Static part of the mock stop-session payload; only session_id varies per request
+_STOP_SESSION_DATA = {
+    "status": "completed",
+    "ended_at": "2024-01-01T00:30:00Z",
+    "duration_minutes": 30,
+    "transcription_status": "completed",
+    "has_recording": True
+}
+
 @app.post("/api/v1/consultation/{session_id}/stop")
 async def stop_consultation_session(session_id: str):
     """Mock consultation session stop endpoint."""
     return {
         "status": "success",
-        "data": {
-            "session_id": session_id,
-            "status": "completed",
-            "ended_at": "2024-01-01T00:30:00Z",
-            "duration_minutes": 30,
-            "transcription_status": "completed",
-            "has_recording": True
-        }
+        "data": {"session_id": session_id, **_STOP_SESSION_DATA}
     }
 
 # Newsletter and Contact Form Endpoints
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, field_validator
+from typing import Awaitable, Callable, Literal, Optional, TypedDict
 
 class NewsletterRequest(BaseModel):
     email: EmailStr
@@ -619,6 +847,70 @@ except ImportError as e:
 # ============================================================================
 
 # NOTE: In-memory report storage deprecated; DB-backed reports are now used via app.api.api_v1.endpoints.reports
+# simple_main still serves the async job API below, so it keeps a local SQLite store.
+# AUTOINCREMENT ids replace the old shared counter; point REPORTS_DB_URI at a file
+# (e.g. "file:reports.db") to keep reports across restarts.
+REPORTS_DB_URI = os.getenv("REPORTS_DB_URI", "file:reports?mode=memory&cache=shared")
+_reports_db = sqlite3.connect(REPORTS_DB_URI, uri=True, check_same_thread=False)
+# WAL only applies to file databases; in-memory ones always stay in "memory" journal mode
+if "mode=memory" not in REPORTS_DB_URI and ":memory:" not in REPORTS_DB_URI:
+    _reports_db.execute("PRAGMA journal_mode=WAL")
+_reports_db.execute(
+    "CREATE TABLE IF NOT EXISTS reports ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT, status TEXT, payload JSON, created_at TEXT)"
+)
+_reports_db.commit()
+_REPORTS_DB_LOCK = threading.Lock()
+
+def _create_report(fields: dict) -> int:
+    """Insert a report row and return its id; the payload mirrors the API response."""
+    with _REPORTS_DB_LOCK, _reports_db:
+        report_id = _reports_db.execute(
+            "INSERT INTO reports (session_id, status, payload, created_at) VALUES (?, ?, json('{}'), ?) RETURNING id",
+            (fields.get("session_id"), fields.get("status"), fields.get("created_at"))
+        ).fetchone()[0]
+        _reports_db.execute(
+            "UPDATE reports SET payload = json(?) WHERE id = ?",
+            (json.dumps({"id": report_id, **fields}), report_id)
+        )
+    return report_id
+
+def _update_report(report_id: int, fields: dict) -> None:
+    with _REPORTS_DB_LOCK, _reports_db:
+        row = _reports_db.execute("SELECT payload FROM reports WHERE id = ?", (report_id,)).fetchone()
+        if row is None:
+            return
+        payload = json.loads(row[0])
+        payload.update(fields)
+        _reports_db.execute(
+            "UPDATE reports SET status = ?, payload = json(?) WHERE id = ?",
+            (payload.get("status"), json.dumps(payload), report_id)
+        )
+
+def _get_report(report_id: int) -> Optional[dict]:
+    with _REPORTS_DB_LOCK:
+        row = _reports_db.execute("SELECT payload FROM reports WHERE id = ?", (report_id,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+def _get_report_status(report_id: int) -> Optional[str]:
+    """Status column only, so pollers never decode the full report payload."""
+    with _REPORTS_DB_LOCK:
+        row = _reports_db.execute("SELECT status FROM reports WHERE id = ?", (report_id,)).fetchone()
+    return row[0] if row else None
+
+# Completed report fields keyed by _report_cache_key(); lets UI retries of the
+# same transcript + medication plan skip the Gemini round-trip entirely.
+_REPORT_CACHE: TTLCache = TTLCache(maxsize=512, ttl=3600)
+_REPORT_CACHE_LOCK = threading.Lock()
+
+def _report_cache_key(transcription: str, medication_plan: list[dict], session_type: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(transcription.encode())
+    digest.update(b"\0")
+    digest.update(json.dumps(medication_plan, sort_keys=True).encode())
+    digest.update(b"\0")
+    digest.update(session_type.encode())
+    return digest.hexdigest()
 
 class MedicationItem(BaseModel):
     drug_name: str
@@ -633,113 +925,102 @@ class SessionReportRequest(BaseModel):
     medication_plan: list[MedicationItem]
     additional_notes: str = ""
     patient_progress: Optional[str] = None  # IMPROVING | STABLE | DETERIORATING
-    session_type: Optional[str] = "follow_up"  # follow_up | first_visit
-
-@app.post("/api/v1/reports/generate-session")
-async def generate_session_report(request: SessionReportRequest):
-    """
-    Phase 1 MVP: Generate post-session report with medications.
-    This is the simplified version for quick implementation.
-    """
-    global report_id_counter
-    
+    session_type: Literal["follow_up", "new_patient"] = "follow_up"
+
+    @field_validator("session_type", mode="before")
+    @classmethod
+    def normalize_session_type(cls, v):
+        """Map client aliases onto the two report types Gemini is prompted for."""
+        if v is None:
+            return "follow_up"
+        v = str(v).strip().lower()
+        if v in {"first_visit", "first", "new", "new_patient"}:
+            return "new_patient"
+        return v
+
+class ComplaintCaptureScore(TypedDict):
+    score: int
+    rationale: str
+
+class SessionReportPayload(TypedDict):
+    generated_report: str
+    concise_summary: str
+    highlight_tags: list[str]
+    complaint_capture_score: ComplaintCaptureScore
+
+class SessionReportBatchItem(SessionReportPayload):
+    # Echo of the REPORT REQUEST id, so replies are matched by id rather than position
+    request_id: int
+
+# Gemini throttles aggressively: cap in-flight calls and requests per minute
+# up front instead of paying for 429 retries under load.
+GEMINI_SEMAPHORE = asyncio.Semaphore(int(os.getenv("GEMINI_MAX_CONCURRENCY", "4")))
+try:
+    from aiolimiter import AsyncLimiter
+    GEMINI_RATE_LIMITER = AsyncLimiter(int(os.getenv("GEMINI_MAX_RPM", "60")), 60)
+except ImportError:
+    GEMINI_RATE_LIMITER = contextlib.nullcontext()
+
+# Futures for reports currently being generated, keyed like _REPORT_CACHE
+_REPORT_INFLIGHT: dict[str, asyncio.Future] = {}
+
+# Strong references to running report jobs so they are not garbage collected
+_REPORT_JOBS: set[asyncio.Task] = set()
+
+# Characters streamed so far for reports still generating; kept out of SQLite
+# so per-chunk progress does not rewrite the payload row.
+_REPORT_PROGRESS: dict[int, int] = {}
+
+# Structured output: Gemini returns JSON matching SessionReportPayload directly,
+# so the coercion round-trip below is only a defensive fallback.
+SESSION_REPORT_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": SessionReportPayload,
+}
+
+# Batched variant: one array element per queued report, each tagged with its request_id
+SESSION_REPORT_BATCH_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": list[SessionReportBatchItem],
+}
+
+# Opt-in batching: with REPORT_BATCH_MAX_SIZE > 1, reports arriving within the window share
+# a single Gemini call. Trade-offs: different patients' transcripts go into one prompt (the
+# model is told to keep them apart, and replies are matched by echoed request_id, but
+# cross-contamination inside the model's answer cannot be ruled out); every report, even
+# a lone one, waits out the window first; and batched reports are not streamed, so
+# /status partial_length only moves once the whole batch reply arrives.
+REPORT_BATCH_WINDOW_SECONDS = int(os.getenv("REPORT_BATCH_WINDOW_MS", "200")) / 1000
+REPORT_BATCH_MAX_SIZE = int(os.getenv("REPORT_BATCH_MAX_SIZE", "1"))
+
+# (report_id, prompt, future resolved with the raw JSON text for that report)
+_REPORT_BATCH_QUEUE: asyncio.Queue = asyncio.Queue()
+_REPORT_BATCHER: Optional[asyncio.Task] = None
+
+def _content_digest(data) -> str:
+    """Short hex digest of a JSON payload; unlike hash(), stable across processes."""
+    return hashlib.blake2b(_json_dumps_sorted(data), digest_size=4).hexdigest()
+
+async def send_json_fast(websocket: WebSocket, data) -> None:
+    """websocket.send_json via orjson; still a text frame, which the frontend JSON.parses."""
+    await websocket.send_text(_json_dumps_text(data))
+
+# Deep fallback only: structured output normally makes the coercion call unnecessary,
+# so it gets a small input window rather than a token-count round-trip.
+COERCION_MAX_CHARS = 2048
+
+_FENCE_RE = re.compile(r"```[a-zA-Z0-9_]*\n|```")
+
+def _parse_ai_json(text: str) -> dict:
     try:
-        if not gemini_service:
-            raise HTTPException(status_code=503, detail="AI service temporarily unavailable")
-        if not request.transcription or not request.transcription.strip():
-            raise HTTPException(status_code=400, detail="Transcription is required")
-        if not request.medication_plan or len(request.medication_plan) == 0:
-            raise HTTPException(status_code=400, detail="At least one medication is required")
-        
-        print(f"📋 Generating session report for {request.session_id}")
-        print(f"💊 Medications: {len(request.medication_plan)}")
-        print(f"📝 Transcript length: {len(request.transcription)} chars")
-        
-        # Format medication plan for AI prompt
-        med_plan_text = "\n".join([
-            f"- {med.drug_name} {med.dosage} - {med.frequency}"
-            + (f" ({med.route})" if med.route else "")
-            + (f"\n  Instructions: {med.instructions}" if med.instructions else "")
-            for med in request.medication_plan
-        ])
-        
-        # Build additional notes section separately to avoid backslashes inside f-string expressions
-        additional_notes_section = ""
-        if request.additional_notes:
-            additional_notes_section = (
-                "**ADDITIONAL CLINICAL NOTES:**\n" + request.additional_notes + "\n"
-            )
-        
-        # Enhanced prompt with medication context and progress
-        enhanced_prompt = f"""Generate a concise clinical summary for a mental health follow-up session.
-
-**CRITICAL INSTRUCTIONS:**
-1. Use ONLY the medication plan provided below - DO NOT modify or add medications
-2. Be concise - each section should be 2-4 sentences maximum
-3. Extract information ONLY from the transcript provided
-
-**TRANSCRIPT:**
-{request.transcription}
-
-**CLINICAL PROGRESS ASSESSMENT:**
-{request.patient_progress or 'Not specified'}
-
-**MEDICATION PLAN (USE EXACTLY AS PROVIDED):**
-{med_plan_text}
-
-{additional_notes_section}
-
-**OUTPUT FORMAT:**
-Generate a structured report with these sections:
-
-## CHIEF COMPLAINT
-[One sentence summary of main concern]
-
-## CURRENT STATUS
-[2-3 sentences about patient's current condition and any changes since last visit]
-
-## MENTAL STATUS EXAMINATION
-- **Mood:** [Patient's stated mood]
-- **Affect:** [Observed affect]
-- **Thought Process:** [Brief description]
-- **Suicidal Ideation:** [Explicitly state "Denied" or describe if present]
-- **Homicidal Ideation:** [Explicitly state "Denied" or describe if present]
-
-## ASSESSMENT
-[2-3 sentences of clinical assessment]
-
-## PLAN
-
-**Medication:**
-{med_plan_text}
-
-**Follow-up:**
-[When patient should return]
-
-Keep it professional, concise, and clinical."""
-        
-        # Determine session type for Gemini prompt
-        requested_type = (request.session_type or "follow_up").lower()
-        gem_session_type = "new_patient" if requested_type in {"first_visit", "first", "new", "new_patient"} else "follow_up"
-
-        # Queue background job to avoid frontend timeouts
-        report_id = report_id_counter
-        report_id_counter += 1
-
-        # Initialize placeholder entry
-        reports_storage[report_id] = {
-            "id": report_id,
-            "session_id": request.session_id,
-            "status": "generating",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "transcription_length": len(request.transcription),
-            "patient_progress": request.patient_progress or None,
-            "medication_plan": [med.dict() for med in request.medication_plan],
-            "session_type": gem_session_type
-        }
+        return _json_loads(_FENCE_RE.sub("", text.strip()))
+    except Exception:
+        return {}
 
-        def _build_med_report_prompt(transcript_text: str, meds_text: str) -> str:
-            return f"""You are an expert medical scribe and quality analyst. Your job is to generate a concise, accurate medical report in English based on a Hindi conversation transcript, and analyze how well the report captures the patient's primary complaints.
+def _build_med_report_prompt(transcript_text: str, meds_text: str) -> str:
+    # Meds are embedded in the JSON example so the AI cannot drop them
+    meds_json_text = meds_text.replace("\\", "\\\\").replace("\n", "\\n") if meds_text else "None documented"
+    return f"""You are an expert medical scribe and quality analyst. Your job is to generate a concise, accurate medical report in English based on a Hindi conversation transcript, and analyze how well the report captures the patient's primary complaints.
 
 **[CONTEXT]**
 
@@ -779,47 +1060,199 @@ Provide a score (0-100) and a one-sentence rationale.
 **[OUTPUT FORMAT]**
 Return ONLY a valid JSON object with NO markdown code fences or extra text:
 {{{{
-  "generated_report": "## CHIEF COMPLAINT\n[content]\n\n## CURRENT STATUS\n[content]\n\n## MENTAL STATUS EXAMINATION\n- **Mood:** ...\n- **Affect:** ...\n- **Thought Process:** ...\n- **Suicidal Ideation:** ...\n- **Homicidal Ideation:** ...\n\n## ASSESSMENT\n[content]\n\n## PLAN\n[content]\n\n## MEDICATION & TREATMENT\nREPLACE_WITH_MEDS",
+  "generated_report": "## CHIEF COMPLAINT\n[content]\n\n## CURRENT STATUS\n[content]\n\n## MENTAL STATUS EXAMINATION\n- **Mood:** ...\n- **Affect:** ...\n- **Thought Process:** ...\n- **Suicidal Ideation:** ...\n- **Homicidal Ideation:** ...\n\n## ASSESSMENT\n[content]\n\n## PLAN\n[content]\n\n## MEDICATION & TREATMENT\n{meds_json_text}",
   "concise_summary": "Provide a 2-4 sentence, clinician-facing English summary of WHAT HAPPENED IN THE SESSION (not about the report). Include primary complaints, salient history/context, notable findings, and the plan/medications as appropriate. Avoid meta commentary. Target ~300-450 characters.",
   "highlight_tags": ["term1", "term2", "term3", "term4", "term5", "term6", "term7"],
   "complaint_capture_score": {{{{"score": 85, "rationale": "..."}}}}
 }}}}"""
 
-        def _parse_ai_json(text: str) -> dict:
-            try:
-                cleaned = text.strip()
-                cleaned = re.sub(r"```[a-zA-Z0-9_]*\n|```", "", cleaned)
-                return json.loads(cleaned)
-            except Exception:
-                return {}
+def _chunk_text(chunk) -> str:
+    """Text of a streamed Gemini chunk. Chunks without parts (a trailing finish_reason or
+    usage-only chunk, a safety stop) give "" instead of the ValueError `.text` raises."""
+    try:
+        parts = chunk.parts
+    except ValueError:
+        return ""
+    return "".join(part.text for part in parts if "text" in part)
+
+async def _stream_report_text(report_id: int, prompt: str) -> str:
+    """Generate one report, streaming so /status can report progress before completion."""
+    chunks: list[str] = []
+    _REPORT_PROGRESS[report_id] = 0
+    async with GEMINI_SEMAPHORE, GEMINI_RATE_LIMITER:
+        ai_stream = await gemini_service.model.generate_content_async(
+            prompt,
+            generation_config=SESSION_REPORT_GENERATION_CONFIG,
+            stream=True
+        )
+        async for chunk in ai_stream:
+            text = _chunk_text(chunk)
+            if not text:
+                continue
+            chunks.append(text)
+            _REPORT_PROGRESS[report_id] += len(text)
+    return "".join(chunks)
+
+async def _resolve_single(report_id: int, prompt: str, future: asyncio.Future) -> None:
+    try:
+        result = await _stream_report_text(report_id, prompt)
+    except Exception as e:  # noqa: BLE001
+        if not future.done():
+            future.set_exception(e)
+    else:
+        if not future.done():
+            future.set_result(result)
 
-        def _run_job():
+async def _resolve_batch(batch: list[tuple[int, str, asyncio.Future]]) -> None:
+    """Send queued reports as one request; fall back to single calls if the reply's ids do not line up."""
+    sections = "\n\n".join(
+        f"=== REPORT REQUEST {report_id} ===\n{prompt}" for report_id, prompt, _ in batch
+    )
+    batch_prompt = (
+        f"You will receive {len(batch)} independent report requests. Handle each one exactly as its "
+        "own instructions describe, without mixing information between them. Return ONLY a JSON array "
+        f"of {len(batch)} objects, one per request, each with a \"request_id\" field set to the number "
+        f"in its REPORT REQUEST header.\n\n{sections}"
+    )
+    try:
+        async with GEMINI_SEMAPHORE, GEMINI_RATE_LIMITER:
+            ai_obj = await gemini_service.model.generate_content_async(
+                batch_prompt,
+                generation_config=SESSION_REPORT_BATCH_GENERATION_CONFIG
+            )
+        items = _json_loads(getattr(ai_obj, "text", ""))
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Batched report generation failed", extra={"batch_size": len(batch), "error": str(e)})
+        items = None
+
+    by_id = {}
+    if isinstance(items, list):
+        by_id = {item.get("request_id"): item for item in items if isinstance(item, dict)}
+    # Every report must come back exactly once under its own id; anything else is retried singly
+    if len(by_id) != len(batch) or len(items) != len(batch) or set(by_id) != {report_id for report_id, _, _ in batch}:
+        await asyncio.gather(*(_resolve_single(*item) for item in batch))
+        return
+    for report_id, _, future in batch:
+        item = by_id[report_id]
+        item.pop("request_id", None)
+        text = json.dumps(item)
+        _REPORT_PROGRESS[report_id] = len(text)
+        if not future.done():
+            future.set_result(text)
+
+async def _report_batcher() -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _REPORT_BATCH_QUEUE.get()]
+        deadline = loop.time() + REPORT_BATCH_WINDOW_SECONDS
+        while len(batch) < REPORT_BATCH_MAX_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
             try:
-                # Build meds summary for the JSON-oriented prompt
-                meds_text = "\n".join([
-                    f"- {m['drug_name']} {m['dosage']} – {m['frequency']}" + (f" ({m.get('route')})" if m.get('route') else '') + (f"\n  Instructions: {m.get('instructions')}" if m.get('instructions') else '')
-                    for m in reports_storage[report_id]["medication_plan"]
-                ])
-                prompt_for_json = _build_med_report_prompt(request.transcription, meds_text)
-                # Inject meds into the JSON template placeholder so the AI cannot drop them
-                prompt_for_json = prompt_for_json.replace(
-                    "REPLACE_WITH_MEDS",
-                    meds_text.replace("\\", "\\\\").replace("\n", "\\n") if meds_text else "None documented"
-                )
+                batch.append(await asyncio.wait_for(_REPORT_BATCH_QUEUE.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # Dispatch without awaiting so the next window keeps collecting; GEMINI_SEMAPHORE bounds the calls
+        job = asyncio.create_task(_resolve_single(*batch[0]) if len(batch) == 1 else _resolve_batch(batch))
+        _REPORT_JOBS.add(job)
+        job.add_done_callback(_REPORT_JOBS.discard)
+
+async def _generate_report_text(report_id: int, prompt: str) -> str:
+    """Queue a report prompt for the batcher and wait for its raw JSON text."""
+    global _REPORT_BATCHER
+    if REPORT_BATCH_MAX_SIZE <= 1:
+        return await _stream_report_text(report_id, prompt)
+    if _REPORT_BATCHER is None or _REPORT_BATCHER.done():
+        _REPORT_BATCHER = asyncio.create_task(_report_batcher())
+    future = asyncio.get_running_loop().create_future()
+    await _REPORT_BATCH_QUEUE.put((report_id, prompt, future))
+    return await future
+
+@app.post("/api/v1/reports/generate-session")
+@limiter.limit("30/minute")  # Each accepted request fans out to Gemini
+async def generate_session_report(request: Request, response: Response, report_data: SessionReportRequest):
+    """
+    Phase 1 MVP: Generate post-session report with medications.
+    This is the simplified version for quick implementation.
+    """
+    try:
+        if not gemini_service:
+            raise HTTPException(status_code=503, detail="AI service temporarily unavailable")
+        if not report_data.transcription or not report_data.transcription.strip():
+            raise HTTPException(status_code=400, detail="Transcription is required")
+        if not report_data.medication_plan or len(report_data.medication_plan) == 0:
+            raise HTTPException(status_code=400, detail="At least one medication is required")
+        
+        logger.info("Generating session report", extra={
+            "session_id": report_data.session_id,
+            "medications": len(report_data.medication_plan),
+            "transcript_chars": len(report_data.transcription)
+        })
+        
+        # Stored dicts come from one pydantic-core dump; prompt lines use attribute access
+        medication_plan: list[dict] = report_data.model_dump(include={"medication_plan"})["medication_plan"]
+        med_lines: list[str] = []
+        for med in report_data.medication_plan:
+            line = f"- {med.drug_name} {med.dosage} – {med.frequency}"
+            if med.route:
+                line += f" ({med.route})"
+            if med.instructions:
+                line += f"\n  Instructions: {med.instructions}"
+            med_lines.append(line)
+        meds_text = "\n".join(med_lines)
+        
+        # Initialize placeholder entry
+        report_id = _create_report({
+            "session_id": report_data.session_id,
+            "status": "generating",
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "transcription_length": len(report_data.transcription),
+            "patient_progress": report_data.patient_progress or None,
+            "medication_plan": medication_plan,
+            "session_type": report_data.session_type
+        })
 
-                ai_obj = gemini_service.model.generate_content(prompt_for_json)
-                raw_text = getattr(ai_obj, "text", "")
+        cache_key = _report_cache_key(
+            report_data.transcription,
+            medication_plan,
+            report_data.session_type
+        )
+        with _REPORT_CACHE_LOCK:
+            cached_fields = _REPORT_CACHE.get(cache_key)
+        if cached_fields is not None:
+            _update_report(report_id, cached_fields)
+            logger.info("Report served from cache", extra={"report_id": report_id})
+            return {"status": "accepted", "report_id": report_id, "session_id": report_data.session_id}
+
+        async def _run_job():
+            # Single-flight: an identical report already being generated is awaited, not re-sent
+            leader = _REPORT_INFLIGHT.get(cache_key)
+            if leader is not None:
+                _update_report(report_id, await leader)
+                return
+            leader = asyncio.get_running_loop().create_future()
+            _REPORT_INFLIGHT[cache_key] = leader
+
+            result_fields = {"status": "failed", "error": "Report generation was cancelled"}
+            try:
+                prompt_for_json = _build_med_report_prompt(report_data.transcription, meds_text)
+                raw_text = await _generate_report_text(report_id, prompt_for_json)
                 parsed = _parse_ai_json(raw_text)
-                # If model returned narrative instead of JSON, ask it to convert to strict JSON
+                # Defensive fallback: structured output should already be valid JSON
                 if (not parsed) or (not isinstance(parsed, dict)) or (not parsed.get("generated_report")) or (not parsed.get("concise_summary")):
                     coercion_prompt = (
                         "Convert the following content into EXACT JSON with keys: "
                         "generated_report (string), concise_summary (string), highlight_tags (array of strings), "
                         "complaint_capture_score (object with score:int and rationale:string). "
                         "For concise_summary: write a 2-4 sentence, session-focused narrative (what happened, key complaints, salient context, notable findings, plan/meds); do NOT mention 'report' or 'summary'. "
-                        "Return ONLY JSON, no prose, no code fences.\n\nCONTENT:\n" + raw_text[:6000]
+                        "Return ONLY JSON, no prose, no code fences.\n\nCONTENT:\n" + raw_text[:COERCION_MAX_CHARS]
                     )
-                    ai_fix = gemini_service.model.generate_content(coercion_prompt)
+                    async with GEMINI_SEMAPHORE, GEMINI_RATE_LIMITER:
+                        ai_fix = await gemini_service.model.generate_content_async(
+                            coercion_prompt,
+                            generation_config=SESSION_REPORT_GENERATION_CONFIG
+                        )
                     raw_fix = getattr(ai_fix, "text", "")
                     parsed = _parse_ai_json(raw_fix)
                 # If the structured JSON came back inside the text field, use it; otherwise, keep the narrative
@@ -828,31 +1261,40 @@ Return ONLY a valid JSON object with NO markdown code fences or extra text:
                 final_report = parsed.get("generated_report") if isinstance(parsed, dict) and parsed.get("generated_report") else raw_text
                 concise = parsed.get("concise_summary") if isinstance(parsed, dict) else None
 
-                reports_storage[report_id].update({
+                result_fields = {
                     "status": "completed",
                     "report_content": final_report,
                     "model_used": getattr(gemini_service, "model_name", "gemini"),
                     "highlight_tags": highlight,
                     "complaint_capture_score": score,
                     "concise_summary": concise
-                })
+                }
+                # Only cache structured results; narrative fallbacks should be retried
+                if isinstance(parsed, dict) and parsed.get("generated_report"):
+                    with _REPORT_CACHE_LOCK:
+                        _REPORT_CACHE[cache_key] = result_fields
             except Exception as e:  # noqa: BLE001
-                reports_storage[report_id].update({
+                result_fields = {
                     "status": "failed",
                     "error": str(e)
-                })
+                }
+            finally:
+                _REPORT_INFLIGHT.pop(cache_key, None)
+                _REPORT_PROGRESS.pop(report_id, None)
+                leader.set_result(result_fields)
+            _update_report(report_id, result_fields)
 
-        threading.Thread(target=_run_job, daemon=True).start()
+        job = asyncio.create_task(_run_job())
+        _REPORT_JOBS.add(job)
+        job.add_done_callback(_REPORT_JOBS.discard)
 
-        print(f"📝 Report job accepted: ID={report_id}")
-        return {"status": "accepted", "report_id": report_id, "session_id": request.session_id}
+        logger.info("Report job accepted", extra={"report_id": report_id})
+        return {"status": "accepted", "report_id": report_id, "session_id": report_data.session_id}
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Error generating session report: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generating session report")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/reports/{report_id}")
@@ -860,36 +1302,23 @@ async def get_report(report_id: int):
     """
     Phase 1 MVP: Retrieve generated report by ID.
     """
-    try:
-        if report_id not in reports_storage:
-            raise HTTPException(status_code=404, detail="Report not found")
-        
-        report = reports_storage[report_id]
-        
-        return {
-            "status": "success",
-            "data": report
-        }
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Error retrieving report: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    report = _get_report(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return {"status": "success", "data": report}
 
 @app.get("/api/v1/reports/{report_id}/status")
 async def get_report_status(report_id: int):
-    try:
-        if report_id not in reports_storage:
-            raise HTTPException(status_code=404, detail="Report not found")
-        item = reports_storage[report_id]
-        return {"status": "success", "data": {"status": item.get("status", "unknown")}}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Error retrieving report: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    status = _get_report_status(report_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return {
+        "status": "success",
+        "data": {
+            "status": status or "unknown",
+            "partial_length": _REPORT_PROGRESS.get(report_id, 0)
+        }
+    }
 
 # ============================================================================
 # END PHASE 1 MVP
@@ -899,7 +1328,7 @@ async def get_report_status(report_id: int):
 # SYMPTOM ASSESSMENT - SIMPLE IN-MEMORY IMPLEMENTATION (MVP)
 # ============================================================================
 
-from typing import Optional, Literal, List
+from typing import Iterable, Optional, Literal, List
 
 class SymptomSearchResult(BaseModel):
     name: str
@@ -948,92 +1377,217 @@ try:
         with open(seed_path, 'r', encoding='utf-8') as f:
             seed_list = json.load(f)
         if isinstance(seed_list, list):
-            existing = {s["name"].lower() for s in GLOBAL_SYMPTOMS}
+            existing = {s["name"].casefold() for s in GLOBAL_SYMPTOMS}
             for item in seed_list:
-                if isinstance(item, dict) and item.get("name") and item["name"].lower() not in existing:
+                name = item.get("name") if isinstance(item, dict) else None
+                if not name:
+                    continue
+                key = name.casefold()
+                if key not in existing:
+                    existing.add(key)
                     GLOBAL_SYMPTOMS.append({
                         "id": len(GLOBAL_SYMPTOMS) + 1,
-                        "name": item["name"],
+                        "name": name,
                         "category": item.get("category")
                     })
-            print(f"✅ Loaded extended symptoms: total={len(GLOBAL_SYMPTOMS)}")
+            logger.info("Loaded extended symptoms: total=%d", len(GLOBAL_SYMPTOMS))
         else:
-            print("⚠️ symptoms_seed.json invalid format; expected list")
+            logger.warning("symptoms_seed.json invalid format; expected list")
     else:
-        print("ℹ️ symptoms_seed.json not found; using built-in symptom subset")
+        logger.info("symptoms_seed.json not found; using built-in symptom subset")
 except Exception as e:
-    print(f"⚠️ Failed to load symptoms_seed.json: {e}")
+    logger.warning("Failed to load symptoms_seed.json: %s", e)
+
+def _indel_distance(a: str, b: str) -> int:
+    """
+    Insert/delete edit distance, len(a) + len(b) - 2 * LCS, with the LCS computed
+    bit-parallel (Allison-Dix) so each character of `b` costs a few int operations.
+    """
+    masks: dict[str, int] = {}
+    for i, ch in enumerate(a):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    row = 0
+    for ch in b:
+        x = masks.get(ch, 0) | row
+        row = x & ((x - ((row << 1) | 1)) ^ x)
+    return len(a) + len(b) - 2 * row.bit_count()
+
+# C-accelerated Indel distance for typo matches; _indel_distance is the pure-Python fallback
+try:
+    from rapidfuzz.distance import Indel as rf_indel
+except ImportError:
+    rf_indel = None
+
+class _BKTree:
+    """Burkhard-Keller tree: metric range queries that prune subtrees by the triangle inequality."""
+
+    def __init__(self, distance, words):
+        self._distance = distance
+        self._root = None  # (word, index, {edge_distance: child})
+        for index, word in enumerate(words):
+            self.add(word, index)
+
+    def add(self, word: str, index: int) -> None:
+        if self._root is None:
+            self._root = (word, index, {})
+            return
+        node = self._root
+        while True:
+            d = self._distance(word, node[0])
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = (word, index, {})
+                return
+            node = child
+
+    def find(self, word: str, radius: int) -> list[tuple[int, int]]:
+        """(index, distance) for all words within `radius` of `word`."""
+        found: list[tuple[int, int]] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node_word, node_index, children = stack.pop()
+            d = self._distance(word, node_word)
+            if d <= radius:
+                found.append((node_index, d))
+            for edge, child in children.items():
+                if d - radius <= edge <= d + radius:
+                    stack.append(child)
+        return found
+
+# Common synonyms and misspellings mapping -> candidate substrings
+_SYMPTOM_SYNONYMS: dict[str, list[str]] = {
+    "adhd": ["adhd", "attention deficit", "attention deficits", "attention difficulties", "hyperactivity", "impulsivity"],
+    "attention deficits": ["attention deficit", "attention difficulties", "adhd"],
+    "attention defecits": ["attention deficit", "attention difficulties", "adhd"],
+    "eating": ["restrictive eating", "binge", "purging", "food", "body image"],
+    "fatigue": ["fatigue", "low energy", "tiredness"],
+    "sleep": ["insomnia", "hypersomnia", "early morning awakening", "nightmare", "sleep paralysis", "circadian"],
+    "trauma": ["ptsd", "post-traumatic", "flashbacks", "hypervigilance"],
+    "anxiety": ["generalized anxiety", "panic", "phobia", "health anxiety", "anticipatory"],
+    "depression": ["depressive", "low mood", "anhedonia"],
+}
+
+# (lower_name, lower_category, name, category, id) per global symptom, so searches
+# never re-normalise the catalogue. Call _rebuild_symptom_index() after extending GLOBAL_SYMPTOMS.
+_SYMPTOM_INDEX: tuple[tuple[str, str, str, Optional[str], int], ...] = ()
+_SYMPTOM_BKTREE: _BKTree = _BKTree(_indel_distance, ())
+_SYMPTOM_INDEX_VERSION = 0
+# (key, alts, indices into _SYMPTOM_INDEX whose name contains the key or any alt)
+_SYNONYM_GROUPS: tuple[tuple[str, tuple[str, ...], tuple[int, ...]], ...] = ()
+# Every 2- and 3-char substring of a lower name or category -> indices into _SYMPTOM_INDEX.
+# A term of length >= 3 can only occur in entries listed under each of its trigrams.
+_SYMPTOM_GRAMS: dict[str, set[int]] = {}
+
+def _rebuild_symptom_index() -> None:
+    global _SYMPTOM_INDEX, _SYMPTOM_BKTREE, _SYMPTOM_INDEX_VERSION, _SYNONYM_GROUPS, _SYMPTOM_GRAMS
+    _SYMPTOM_INDEX_VERSION += 1
+    _SYMPTOM_INDEX = tuple(
+        (s["name"].lower(), (s.get("category") or "").lower(), s["name"], s.get("category"), s["id"])
+        for s in GLOBAL_SYMPTOMS
+    )
+    grams: dict[str, set[int]] = {}
+    for i, (nl, cl, _, _, _) in enumerate(_SYMPTOM_INDEX):
+        for text in (nl, cl):
+            for j in range(len(text) - 1):
+                grams.setdefault(text[j:j + 2], set()).add(i)
+                if j + 3 <= len(text):
+                    grams.setdefault(text[j:j + 3], set()).add(i)
+    _SYMPTOM_GRAMS = grams
+    _SYNONYM_GROUPS = tuple(
+        (key, tuple(alts), tuple(
+            i for i, entry in enumerate(_SYMPTOM_INDEX)
+            if key in entry[0] or any(a in entry[0] for a in alts)
+        ))
+        for key, alts in _SYMPTOM_SYNONYMS.items()
+    )
+    _SYMPTOM_BKTREE = _BKTree(
+        rf_indel.distance if rf_indel is not None else _indel_distance,
+        [entry[0] for entry in _SYMPTOM_INDEX]
+    )
+
+_rebuild_symptom_index()
+
+def _symptom_candidates(term: str) -> Iterable[int]:
+    """Ascending indices of _SYMPTOM_INDEX whose name or category may contain `term`."""
+    if len(term) < 2:
+        return range(len(_SYMPTOM_INDEX))
+    if len(term) == 2:
+        return sorted(_SYMPTOM_GRAMS.get(term, ()))
+    postings = [_SYMPTOM_GRAMS.get(term[i:i + 3]) for i in range(len(term) - 2)]
+    if not all(postings):
+        return ()
+    postings.sort(key=len)
+    return sorted(set.intersection(*postings))
 
 # In-memory stores
 USER_CUSTOM_SYMPTOMS: dict[str, List[dict]] = {}
 PATIENT_SYMPTOMS: dict[int, List[dict]] = {}
+# Reverse index: patient symptom id -> (patient_id, record) for O(1) deletes
+_PATIENT_SYMPTOM_INDEX: dict[int, tuple[int, dict]] = {}
 _CUSTOM_ID_COUNTER = 1000
 _PATIENT_SYMPTOM_ID = 1
 
-@app.get("/api/v1/symptoms/search", response_model=List[SymptomSearchResult])
-async def search_symptoms(q: str, request: Request):
-    """Robust search across names, categories, synonyms and fuzzy matches."""
-    import difflib
-    user = get_current_user_from_request(request)
-    term = q.strip().lower()
-    if len(term) < 2:
-        return []
-
-    # Build indices
-    names = [(s["name"], s.get("category"), s["id"]) for s in GLOBAL_SYMPTOMS]
-    categories = [s.get("category", "").lower() for s in GLOBAL_SYMPTOMS]
-
-    # Common synonyms and misspellings mapping -> candidate substrings
-    synonyms: dict[str, list[str]] = {
-        "adhd": ["adhd", "attention deficit", "attention deficits", "attention difficulties", "hyperactivity", "impulsivity"],
-        "attention deficits": ["attention deficit", "attention difficulties", "adhd"],
-        "attention defecits": ["attention deficit", "attention difficulties", "adhd"],
-        "eating": ["restrictive eating", "binge", "purging", "food", "body image"],
-        "fatigue": ["fatigue", "low energy", "tiredness"],
-        "sleep": ["insomnia", "hypersomnia", "early morning awakening", "nightmare", "sleep paralysis", "circadian"],
-        "trauma": ["ptsd", "post-traumatic", "flashbacks", "hypervigilance"],
-        "anxiety": ["generalized anxiety", "panic", "phobia", "health anxiety", "anticipatory"],
-        "depression": ["depressive", "low mood", "anhedonia"],
-    }
+@functools.lru_cache(maxsize=4096)
+def _search_global(term: str, index_version: int) -> tuple[tuple[float, str, str, Optional[str], int], ...]:
+    """
+    Score global symptoms for a normalised term as (score, key, name, category, id).
+    index_version ties cached results to the _SYMPTOM_INDEX they were computed from.
+    """
+    scores: dict[str, tuple[float, str, Optional[str], int]] = {}
 
-    # Scoring helper
-    scores: dict[str, tuple[float, dict]] = {}
-
-    def add_result(name: str, cat: Optional[str], sid: Optional[int], score: float):
+    def add_result(name: str, cat: Optional[str], sid: int, score: float):
         key = name.lower()
-        payload = {"name": name, "category": cat, "source_id": sid}
         if key not in scores or score > scores[key][0]:
-            scores[key] = (score, payload)
+            scores[key] = (score, name, cat, sid)
 
-    # 1) Name exact/contains
-    for n, c, sid in names:
-        nl = n.lower()
+    # 1) Name exact/contains and 2) category match (e.g., "eating", "sleep") in one pass over the
+    # entries sharing the term's n-grams; a category hit never outranks a name hit, so it is only
+    # checked when the name misses
+    for i in _symptom_candidates(term):
+        nl, cl, n, c, sid = _SYMPTOM_INDEX[i]
         if nl == term:
             add_result(n, c, sid, 1.0)
         elif term in nl:
             add_result(n, c, sid, 0.9)
-
-    # 2) Category match (e.g., "eating", "sleep")
-    for n, c, sid in names:
-        cl = (c or "").lower()
-        if cl and term in cl:
+        elif cl and term in cl:
             add_result(n, c, sid, 0.78)
 
-    # 3) Synonyms
-    for key, alts in synonyms.items():
+    # 3) Synonyms: each triggered group's member names are precomputed
+    for key, alts, members in _SYNONYM_GROUPS:
         if term in key or any(term in a for a in alts):
-            # include all names that contain any alt
-            for n, c, sid in names:
-                nl = n.lower()
-                if (key in nl) or any(a in nl for a in alts):
-                    add_result(n, c, sid, 0.82)
-
-    # 4) Fuzzy match for typos
-    for n, c, sid in names:
-        ratio = difflib.SequenceMatcher(None, term, n.lower()).ratio()
-        if ratio >= 0.8:
+            for i in members:
+                _, _, n, c, sid = _SYMPTOM_INDEX[i]
+                add_result(n, c, sid, 0.82)
+
+    # 4) Fuzzy match for typos: similarity 1 - d / (len_a + len_b) >= 0.8, i.e. 5 * d <= len_a + len_b.
+    # That bound never exceeds len(term) // 2, so the tree query is a lossless candidate set.
+    for idx, distance in _SYMPTOM_BKTREE.find(term, len(term) // 2):
+        nl, _, n, c, sid = _SYMPTOM_INDEX[idx]
+        if 5 * distance <= len(term) + len(nl):
             add_result(n, c, sid, 0.76)
 
+    return tuple((score, key, name, cat, sid) for key, (score, name, cat, sid) in scores.items())
+
+@app.get("/api/v1/symptoms/search", response_model=List[SymptomSearchResult])
+async def search_symptoms(q: str, request: Request):
+    """Robust search across names, categories, synonyms and fuzzy matches."""
+    user = get_current_user_from_request(request)
+    term = q.strip().lower()
+    if len(term) < 2:
+        return []
+
+    # Global matches are cached per term; only the user's custom symptoms are scored per request
+    scores: dict[str, tuple[float, dict]] = {
+        key: (score, {"name": n, "category": c, "source_id": sid})
+        for score, key, n, c, sid in _search_global(term, _SYMPTOM_INDEX_VERSION)
+    }
+
+    def add_result(name: str, cat: Optional[str], sid: Optional[int], score: float):
+        key = name.lower()
+        payload = {"name": name, "category": cat, "source_id": sid}
+        if key not in scores or score > scores[key][0]:
+            scores[key] = (score, payload)
+
     # 5) User custom
     user_key = user.id
     for c in USER_CUSTOM_SYMPTOMS.get(user_key, []):
@@ -1042,7 +1596,7 @@ async def search_symptoms(q: str, request: Request):
             add_result(c["name"], None, c["id"], 0.7)
 
     # Return top 20 sorted by score
-    sorted_payloads = [p for _, p in sorted(scores.values(), key=lambda x: x[0], reverse=True)][:20]
+    sorted_payloads = [p for _, p in heapq.nlargest(20, scores.values(), key=lambda x: x[0])]
     return [SymptomSearchResult(name=p["name"], type="global", source_id=p["source_id"], category=p.get("category")) for p in sorted_payloads]
 
 @app.post("/api/v1/patients/{patient_id}/symptoms", response_model=PatientSymptomResponse, status_code=201)
@@ -1068,6 +1622,7 @@ async def assign_symptom_to_patient(patient_id: int, payload: AssignSymptomReque
         "duration": payload.duration.strip(),
         "recorded_at": datetime.now(timezone.utc).isoformat()
     }
+    _PATIENT_SYMPTOM_INDEX[_PATIENT_SYMPTOM_ID] = (patient_id, record)
     _PATIENT_SYMPTOM_ID += 1
     PATIENT_SYMPTOMS[patient_id].insert(0, record)
     return PatientSymptomResponse(**record)
@@ -1075,68 +1630,105 @@ async def assign_symptom_to_patient(patient_id: int, payload: AssignSymptomReque
 @app.get("/api/v1/patients/{patient_id}/symptoms", response_model=List[PatientSymptomResponse])
 async def get_patient_symptoms(patient_id: int, request: Request):
     _ = get_current_user_from_request(request)
-    items = PATIENT_SYMPTOMS.get(patient_id, [])
-    return [PatientSymptomResponse(**i) for i in items]
+    # Records are built from a validated AssignSymptomRequest at insert time, so they are
+    # serialised as-is; response_model stays for the OpenAPI schema only
+    return ORJSONResponse(content=PATIENT_SYMPTOMS.get(patient_id, []))
 
 @app.delete("/api/v1/patient_symptoms/{patient_symptom_id}", status_code=204)
 async def delete_patient_symptom(patient_symptom_id: int, request: Request):
     _ = get_current_user_from_request(request)
-    for pid, items in PATIENT_SYMPTOMS.items():
-        for i, rec in enumerate(items):
-            if rec["id"] == patient_symptom_id:
-                del items[i]
-                return
-    raise HTTPException(status_code=404, detail="Symptom assignment not found")
-
+    entry = _PATIENT_SYMPTOM_INDEX.pop(patient_symptom_id, None)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Symptom assignment not found")
+    pid, rec = entry
+    PATIENT_SYMPTOMS[pid].remove(rec)
+
+
+# Static mock payloads, serialised once at import
+_CLINICAL_INSIGHTS_BODY = _static_json({
+    "status": "success",
+    "data": {
+        "insights": {
+            "key_clinical_findings": [
+                "Patient appears well-oriented and cooperative",
+                "No signs of acute distress observed",
+                "Communication clear and appropriate"
+            ],
+            "differential_diagnosis": [
+                "Normal health status - no pathology indicated",
+                "Routine health maintenance encounter"
+            ],
+            "treatment_recommendations": [
+                "Continue current lifestyle patterns",
+                "Maintain regular exercise routine",
+                "Follow balanced nutrition guidelines"
+            ],
+            "follow_up_priorities": [
+                "Schedule routine follow-up in 6 months",
+                "Monitor for any new symptoms",
+                "Continue preventive care measures"
+            ],
+            "confidence": 0.94
+        },
+        "metadata": {
+            "generated_at": "2024-01-01T00:30:00Z",
+            "model_used": "gemini-2.5-flash",
+            "analysis_type": "clinical_insights"
+        }
+    }
+})
+
+_REPORTS_HEALTH_BODY = _static_json({
+    "status": "success",
+    "data": {
+        "gemini_service": "available",
+        "vertex_ai": "connected",
+        "timestamp": "2024-01-01T00:00:00Z",
+        "version": "1.0.0"
+    }
+})
 
 @app.post("/api/v1/reports/insights")
 async def generate_clinical_insights_mock(request_data: dict):
     """Mock AI-powered clinical insights generation."""
-    return {
-        "status": "success",
-        "data": {
-            "insights": {
-                "key_clinical_findings": [
-                    "Patient appears well-oriented and cooperative",
-                    "No signs of acute distress observed",
-                    "Communication clear and appropriate"
-                ],
-                "differential_diagnosis": [
-                    "Normal health status - no pathology indicated",
-                    "Routine health maintenance encounter"
-                ],
-                "treatment_recommendations": [
-                    "Continue current lifestyle patterns",
-                    "Maintain regular exercise routine",
-                    "Follow balanced nutrition guidelines"
-                ],
-                "follow_up_priorities": [
-                    "Schedule routine follow-up in 6 months",
-                    "Monitor for any new symptoms",
-                    "Continue preventive care measures"
-                ],
-                "confidence": 0.94
-            },
-            "metadata": {
-                "generated_at": "2024-01-01T00:30:00Z",
-                "model_used": "gemini-2.5-flash",
-                "analysis_type": "clinical_insights"
-            }
-        }
-    }
+    return Response(content=_CLINICAL_INSIGHTS_BODY, media_type="application/json")
 
 @app.get("/api/v1/reports/health")
 async def reports_health_check():
     """Mock AI services health check."""
-    return {
-        "status": "success",
-        "data": {
-            "gemini_service": "available",
-            "vertex_ai": "connected",
-            "timestamp": "2024-01-01T00:00:00Z",
-            "version": "1.0.0"
-        }
-    }
+    return Response(content=_REPORTS_HEALTH_BODY, media_type="application/json")
+
+# Key terms analysis for mental health
+MENTAL_HEALTH_INDICATORS = {
+    "anxiety": ["anxious", "anxiety", "worry", "nervous", "panic", "restless", "चिंता", "घबराट"],
+    "depression": ["sad", "depression", "hopeless", "empty", "tired", "worthless", "उदास", "निराश"],
+    "sleep": ["sleep", "insomnia", "tired", "rest", "awake", "झोप", "थकवा"],
+    "mood": ["mood", "happy", "sad", "angry", "irritable", "मूड", "राग"],
+    "stress": ["stress", "pressure", "overwhelmed", "burden", "तणाव", "दबाव"],
+    "family": ["family", "relationship", "partner", "कुटुंब", "नातेसंबंध"],
+    "work": ["work", "job", "office", "career", "काम", "नोकरी"]
+}
+
+# Aho-Corasick automaton mapping each keyword to every category that lists it
+try:
+    import ahocorasick
+    _INSIGHT_AUTOMATON = ahocorasick.Automaton()
+    _keyword_categories: dict[str, tuple[str, ...]] = {}
+    for _category, _keywords in MENTAL_HEALTH_INDICATORS.items():
+        for _keyword in _keywords:
+            _keyword_categories[_keyword] = _keyword_categories.get(_keyword, ()) + (_category,)
+    for _keyword, _categories in _keyword_categories.items():
+        _INSIGHT_AUTOMATON.add_word(_keyword, _categories)
+    _INSIGHT_AUTOMATON.make_automaton()
+except ImportError:
+    _INSIGHT_AUTOMATON = None
+
+# UTF-8 keyword bytes for the fallback scan; UTF-8 is self-synchronising, so a byte
+# substring hit is exactly a character substring hit, Devanagari included
+_INDICATOR_KEYWORD_BYTES: dict[str, tuple[bytes, ...]] = {
+    category: tuple(keyword.encode("utf-8") for keyword in keywords)
+    for category, keywords in MENTAL_HEALTH_INDICATORS.items()
+}
 
 @app.post("/api/v1/reports/live-insights")
 async def generate_live_insights(request_data: dict):
@@ -1167,27 +1759,25 @@ async def generate_live_insights(request_data: dict):
         
         # Generate mental health focused live insights based on transcription
         # This analyzes the real transcription text for mental health indicators
-        
-        # Key terms analysis for mental health
-        mental_health_indicators = {
-            "anxiety": ["anxious", "anxiety", "worry", "nervous", "panic", "restless", "चिंता", "घबराट"],
-            "depression": ["sad", "depression", "hopeless", "empty", "tired", "worthless", "उदास", "निराश"],
-            "sleep": ["sleep", "insomnia", "tired", "rest", "awake", "झोप", "थकवा"],
-            "mood": ["mood", "happy", "sad", "angry", "irritable", "मूड", "राग"],
-            "stress": ["stress", "pressure", "overwhelmed", "burden", "तणाव", "दबाव"],
-            "family": ["family", "relationship", "partner", "कुटुंब", "नातेसंबंध"],
-            "work": ["work", "job", "office", "career", "काम", "नोकरी"]
-        }
-        
         findings = []
         recommendations = []
         confidence = 0.0
         
         text_lower = transcription_text.lower()
         
+        # One pass over the transcript finds every indicator category present
+        if _INSIGHT_AUTOMATON is not None:
+            hit_categories = {category for _, categories in _INSIGHT_AUTOMATON.iter(text_lower) for category in categories}
+        else:
+            text_bytes = text_lower.encode("utf-8")
+            hit_categories = {
+                category for category, keywords in _INDICATOR_KEYWORD_BYTES.items()
+                if any(keyword in text_bytes for keyword in keywords)
+            }
+        
         # Analyze for key indicators
-        for category, keywords in mental_health_indicators.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for category in MENTAL_HEALTH_INDICATORS:
+            if category in hit_categories:
                 if category == "anxiety":
                     findings.append("Patient reports anxiety symptoms")
                     recommendations.append("Consider anxiety management techniques and breathing exercises")
@@ -1259,7 +1849,7 @@ async def create_intake_patient(patient_data: dict):
     """Create a new intake patient record (Stage 1)."""
     try:
         # Mock patient creation for demonstration
-        patient_id = f"intake-{hash(str(patient_data)) % 10000:04d}"
+        patient_id = f"intake-{int(_content_digest(patient_data), 16) % 10000:04d}"
         
         return {
             "status": "success",
@@ -1276,121 +1866,197 @@ async def create_intake_patient(patient_data: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create patient: {str(e)}")
 
-@app.get("/api/v1/intake/symptoms")  
-async def search_intake_symptoms(q: str, limit: int = 20):
+# Enhanced local symptom database with comprehensive coverage
+_ENHANCED_SYMPTOMS: tuple[dict, ...] = (
+    # Anxiety Disorders
+    {"id": "anx-001", "name": "Generalized Anxiety Disorder", "description": "Excessive worry about multiple life areas", "categories": ["ICD11-6B00"], "source": "medical_db", "aliases": ["GAD", "chronic anxiety", "persistent worry", "anxiety disorder", "generalized anxiety"]},
+    {"id": "anx-002", "name": "Panic Disorder", "description": "Recurrent unexpected panic attacks", "categories": ["ICD11-6B01"], "source": "medical_db", "aliases": ["panic attacks", "panic episodes", "anxiety attacks"]},
+    {"id": "anx-003", "name": "Social Anxiety Disorder", "description": "Fear of social situations and scrutiny", "categories": ["ICD11-6B04"], "source": "medical_db", "aliases": ["social phobia", "social fear", "performance anxiety"]},
+    {"id": "anx-004", "name": "Specific Phobia", "description": "Excessive fear of specific objects or situations", "categories": ["ICD11-6B03"], "source": "medical_db", "aliases": ["phobic disorder", "irrational fear", "phobia"]},
+    
+    # ADHD and Attention
+    {"id": "adhd-001", "name": "Attention Deficit Hyperactivity Disorder", "description": "Persistent inattention and/or hyperactivity-impulsivity", "categories": ["ICD11-6A05"], "source": "medical_db", "aliases": ["ADHD", "ADD", "attention deficit", "hyperactivity disorder", "attention problems"]},
+    {"id": "adhd-002", "name": "Attention Difficulties", "description": "Problems with focus and concentration", "categories": ["ICD11-6A05"], "source": "medical_db", "aliases": ["focus problems", "concentration issues", "distractibility", "attention span"]},
+    
+    # Depression and Mood
+    {"id": "dep-001", "name": "Major Depressive Disorder", "description": "Persistent depressed mood and loss of interest", "categories": ["ICD11-6A70"], "source": "medical_db", "aliases": ["MDD", "depression", "clinical depression", "major depression", "depressive disorder"]},
+    {"id": "dep-002", "name": "Bipolar Disorder", "description": "Alternating periods of mania and depression", "categories": ["ICD11-6A60"], "source": "medical_db", "aliases": ["BPD", "bipolar", "manic depression", "bipolar episodes", "mood swings"]},
+    {"id": "dep-003", "name": "Persistent Depressive Disorder", "description": "Chronic depressive symptoms for at least 2 years", "categories": ["ICD11-6A71"], "source": "medical_db", "aliases": ["dysthymia", "chronic depression", "persistent depression"]},
+    
+    # OCD and Related
+    {"id": "ocd-001", "name": "Obsessive-Compulsive Disorder", "description": "Recurrent obsessions and/or compulsions", "categories": ["ICD11-6B20"], "source": "medical_db", "aliases": ["OCD", "obsessive compulsive", "obsessions", "compulsions", "intrusive thoughts"]},
+    {"id": "ocd-002", "name": "Body Dysmorphic Disorder", "description": "Preoccupation with perceived defects in appearance", "categories": ["ICD11-6B21"], "source": "medical_db", "aliases": ["BDD", "body dysmorphia", "body image disorder"]},
+    
+    # Trauma and PTSD
+    {"id": "ptsd-001", "name": "Post-Traumatic Stress Disorder", "description": "Persistent symptoms following traumatic events", "categories": ["ICD11-6B40"], "source": "medical_db", "aliases": ["PTSD", "trauma response", "traumatic stress", "post traumatic", "combat stress"]},
+    {"id": "ptsd-002", "name": "Complex PTSD", "description": "PTSD with additional symptoms from prolonged trauma", "categories": ["ICD11-6B41"], "source": "medical_db", "aliases": ["C-PTSD", "CPTSD", "complex trauma", "complex PTSD"]},
+    {"id": "ptsd-003", "name": "Acute Stress Reaction", "description": "Immediate response to exceptional stressor", "categories": ["ICD11-6B41"], "source": "medical_db", "aliases": ["acute stress", "crisis reaction", "stress response"]},
+    
+    # Sleep Disorders
+    {"id": "sleep-001", "name": "Insomnia Disorder", "description": "Difficulty initiating or maintaining sleep", "categories": ["ICD11-7A00"], "source": "medical_db", "aliases": ["insomnia", "sleep problems", "sleeplessness", "can't sleep"]},
+    {"id": "sleep-002", "name": "Nightmare Disorder", "description": "Repeated disturbing dreams causing distress", "categories": ["ICD11-7A03"], "source": "medical_db", "aliases": ["nightmares", "bad dreams", "night terrors"]},
+    
+    # Eating Disorders
+    {"id": "eat-001", "name": "Anorexia Nervosa", "description": "Restriction of food intake leading to low body weight", "categories": ["ICD11-6B80"], "source": "medical_db", "aliases": ["anorexia", "restrictive eating", "eating disorder", "ED"]},
+    {"id": "eat-002", "name": "Bulimia Nervosa", "description": "Binge eating followed by compensatory behaviors", "categories": ["ICD11-6B81"], "source": "medical_db", "aliases": ["bulimia", "binge-purge", "eating disorder", "ED"]},
+    {"id": "eat-003", "name": "Binge Eating Disorder", "description": "Recurrent episodes of binge eating without compensation", "categories": ["ICD11-6B82"], "source": "medical_db", "aliases": ["BED", "compulsive overeating", "binge eating", "eating disorder", "ED"]},
+    
+    # Sexual Health
+    {"id": "sex-001", "name": "Sexual Desire Dysfunction", "description": "Persistent lack or loss of sexual desire", "categories": ["ICD11-6C70"], "source": "medical_db", "aliases": ["sexual dysfunction", "low libido", "lack of sexual interest", "sexual desire disorder", "sexual problems"]},
+    {"id": "sex-002", "name": "Sexual Arousal Dysfunction", "description": "Persistent difficulty with sexual arousal", "categories": ["ICD11-6C71"], "source": "medical_db", "aliases": ["arousal disorder", "sexual arousal difficulty", "sexual dysfunction"]},
+    {"id": "sex-003", "name": "Orgasmic Dysfunction", "description": "Persistent difficulty achieving orgasm", "categories": ["ICD11-6C72"], "source": "medical_db", "aliases": ["anorgasmia", "orgasm problems", "climax difficulties", "sexual dysfunction"]},
+    {"id": "sex-004", "name": "Premature Ejaculation", "description": "Persistent early ejaculation during sexual activity", "categories": ["ICD11-6C73"], "source": "medical_db", "aliases": ["PE", "early ejaculation", "rapid ejaculation", "sexual dysfunction"]},
+    {"id": "sex-005", "name": "Sexual Pain Disorders", "description": "Pain during sexual activity", "categories": ["ICD11-6C75"], "source": "medical_db", "aliases": ["dyspareunia", "vaginismus", "sexual pain", "painful intercourse", "sexual dysfunction"]},
+    
+    # Substance Use
+    {"id": "sub-001", "name": "Alcohol Use Disorder", "description": "Problematic pattern of alcohol use", "categories": ["ICD11-6C40"], "source": "medical_db", "aliases": ["alcoholism", "alcohol addiction", "alcohol dependence", "drinking problem"]},
+    {"id": "sub-002", "name": "Cannabis Use Disorder", "description": "Problematic pattern of cannabis use", "categories": ["ICD11-6C41"], "source": "medical_db", "aliases": ["marijuana addiction", "cannabis dependence", "weed addiction"]},
+    
+    # Common Symptoms
+    {"id": "sym-001", "name": "Fatigue", "description": "Persistent tiredness not relieved by rest", "categories": ["ICD11-MB23"], "source": "medical_db", "aliases": ["exhaustion", "tiredness", "low energy", "chronic fatigue"]},
+    {"id": "sym-002", "name": "Mood Swings", "description": "Rapid changes in emotional state", "categories": ["ICD11-6A60"], "source": "medical_db", "aliases": ["emotional instability", "mood changes", "emotional ups and downs"]},
+    {"id": "sym-003", "name": "Irritability", "description": "Increased sensitivity to frustration and anger", "categories": ["ICD11-6A70"], "source": "medical_db", "aliases": ["anger", "frustration", "short temper", "agitation"]},
+    {"id": "sym-004", "name": "Social Withdrawal", "description": "Avoiding social contact and isolation", "categories": ["ICD11-6A70"], "source": "medical_db", "aliases": ["isolation", "avoiding people", "social isolation", "withdrawal"]},
+)
+
+# (lower_name, lower_description, lower_aliases, search_blob, symptom), parallel to _ENHANCED_SYMPTOMS.
+# The blob joins every searchable field with newlines; query words come from str.split(),
+# so they never contain whitespace and cannot match across two fields.
+def _lower_intake_entry(symptom: dict) -> tuple[str, str, tuple[str, ...], str, dict]:
+    name_l = symptom["name"].lower()
+    description_l = symptom["description"].lower()
+    aliases_l = tuple(a.lower() for a in symptom.get("aliases", []))
+    return name_l, description_l, aliases_l, "\n".join((name_l, description_l, *aliases_l)), symptom
+
+_ENHANCED_LOWER: tuple[tuple[str, str, tuple[str, ...], str, dict], ...] = tuple(
+    _lower_intake_entry(s) for s in _ENHANCED_SYMPTOMS
+)
+
+# Trigram -> indices of _ENHANCED_SYMPTOMS whose name, aliases or description contain it.
+# Any substring hit of length >= 3 must appear in every posting list of its trigrams.
+# Typeahead prefixes of one or two characters are looked up whole in _INTAKE_SHORT_GRAMS.
+_INTAKE_TRIGRAMS: dict[str, set[int]] = {}
+_INTAKE_SHORT_GRAMS: dict[str, set[int]] = {}
+for _idx, (_name, _description, _aliases, _, _) in enumerate(_ENHANCED_LOWER):
+    for _text in (_name, _description, *_aliases):
+        for _i in range(len(_text)):
+            _INTAKE_SHORT_GRAMS.setdefault(_text[_i], set()).add(_idx)
+            if _i + 2 <= len(_text):
+                _INTAKE_SHORT_GRAMS.setdefault(_text[_i:_i + 2], set()).add(_idx)
+            if _i + 3 <= len(_text):
+                _INTAKE_TRIGRAMS.setdefault(_text[_i:_i + 3], set()).add(_idx)
+
+def _intake_candidates(fragment: str) -> set[int]:
+    """Indices of symptoms that may contain `fragment` (len >= 3) in a searchable field."""
+    postings = [_INTAKE_TRIGRAMS.get(fragment[i:i + 3]) for i in range(len(fragment) - 2)]
+    if not all(postings):
+        return set()
+    postings.sort(key=len)
+    return set.intersection(*postings)
+
+# (term, ids of every symptom it matched) for recent cache misses. A query that extends one of
+# these can only match a subset of its ids, provided the earlier term is a single word or has no
+# word of 2 chars or fewer (such terms skip the word fallback, which the longer query may use).
+_RECENT_INTAKE_MATCHES: deque[tuple[str, tuple[int, ...]]] = deque(maxlen=8)
+
+def _prefix_candidates(search_term: str) -> Optional[tuple[int, ...]]:
+    """Match ids of the longest recent term that `search_term` extends, if any."""
+    best: Optional[tuple[str, tuple[int, ...]]] = None
+    for prev, ids in tuple(_RECENT_INTAKE_MATCHES):
+        if search_term.startswith(prev) and (best is None or len(prev) > len(best[0])):
+            words = prev.split()
+            if len(words) <= 1 or all(len(word) > 2 for word in words):
+                best = (prev, ids)
+    return best[1] if best else None
+
+@functools.lru_cache(maxsize=4096)
+def _search_intake(search_term: str, limit: int) -> tuple[tuple[dict, ...], int, int]:
+    """(ranked symptoms, medical_db count, custom count) for a normalised query.
+
+    Cached because typeahead repeats prefixes.
+    """
+    filtered_symptoms = []
+    
+    logger.debug("Intake symptom search for %r", search_term)
+
+    # Narrow to the matches of a query this one extends, else to symptoms sharing the query's
+    # trigrams; short queries hit their exact posting list
+    candidate_ids = _prefix_candidates(search_term)
+    if candidate_ids is None:
+        if len(search_term) >= 3:
+            trigram_ids = _intake_candidates(search_term)
+            words = search_term.split()
+            # The word-level fallback needs every word (> 2 chars) somewhere in the symptom
+            if all(len(word) > 2 for word in words):
+                trigram_ids |= set.intersection(*(_intake_candidates(word) for word in words))
+            candidate_ids = sorted(trigram_ids)
+        elif search_term:
+            candidate_ids = sorted(_INTAKE_SHORT_GRAMS.get(search_term, ()))
+        else:
+            candidate_ids = range(len(_ENHANCED_LOWER))
+    
+    words = search_term.split()
+    matched_ids = []
+    for idx in candidate_ids:
+        name_l, description_l, aliases_l, search_blob, symptom = _ENHANCED_LOWER[idx]
+        relevance_score = 0
+        
+        # Exact name match (highest priority)
+        if search_term == name_l:
+            relevance_score = 1.0
+            logger.debug("Exact name match: %s", symptom["name"])
+        # Name contains search term
+        elif search_term in name_l:
+            relevance_score = 0.9
+            logger.debug("Name contains: %s", symptom["name"])
+        # Alias exact match
+        elif search_term in aliases_l:
+            relevance_score = 0.95
+            logger.debug("Exact alias match: %s", symptom["name"])
+        # Alias contains search term (THIS IS THE KEY FIX)
+        elif any(search_term in alias for alias in aliases_l):
+            relevance_score = 0.8
+            logger.debug("Alias contains %r: %s", search_term, symptom["name"])
+        # Description contains search term
+        elif search_term in description_l:
+            relevance_score = 0.6
+            logger.debug("Description contains: %s", symptom["name"])
+        
+        # Word-level matching for partial searches (fallback)
+        # Every word must be meaningful (> 2 chars) and appear in some field
+        if relevance_score == 0 and all(len(word) > 2 and word in search_blob for word in words):
+            relevance_score = 0.5
+            logger.debug("All words match: %s (matched: %s)", symptom["name"], words)
+        
+        if relevance_score > 0:
+            matched_ids.append(idx)
+            filtered_symptoms.append({**symptom, "relevance_score": relevance_score})
+    _RECENT_INTAKE_MATCHES.append((search_term, tuple(matched_ids)))
+    
+    # Sort by relevance score
+    filtered_symptoms.sort(key=lambda x: x["relevance_score"], reverse=True)
+    results = tuple(filtered_symptoms[:limit])
+
+    # Tally sources in one pass over the page
+    medical_db_count = custom_count = 0
+    for symptom in results:
+        source = symptom.get("source")
+        if source == "medical_db":
+            medical_db_count += 1
+        elif source == "custom":
+            custom_count += 1
+    return results, medical_db_count, custom_count
+
+@app.get("/api/v1/intake/symptoms")
+def search_intake_symptoms(q: str, limit: int = 20):
     """Search for symptoms using comprehensive ICD-11 database."""
     try:
         # Use enhanced local database directly (ICD-11 service has dependency issues)
-        print(f"Searching for: {q}")
-        
-        # Enhanced local symptom database with comprehensive coverage
-        enhanced_symptoms = [
-            # Anxiety Disorders
-            {"id": "anx-001", "name": "Generalized Anxiety Disorder", "description": "Excessive worry about multiple life areas", "categories": ["ICD11-6B00"], "source": "medical_db", "aliases": ["GAD", "chronic anxiety", "persistent worry", "anxiety disorder", "generalized anxiety"]},
-            {"id": "anx-002", "name": "Panic Disorder", "description": "Recurrent unexpected panic attacks", "categories": ["ICD11-6B01"], "source": "medical_db", "aliases": ["panic attacks", "panic episodes", "anxiety attacks"]},
-            {"id": "anx-003", "name": "Social Anxiety Disorder", "description": "Fear of social situations and scrutiny", "categories": ["ICD11-6B04"], "source": "medical_db", "aliases": ["social phobia", "social fear", "performance anxiety"]},
-            {"id": "anx-004", "name": "Specific Phobia", "description": "Excessive fear of specific objects or situations", "categories": ["ICD11-6B03"], "source": "medical_db", "aliases": ["phobic disorder", "irrational fear", "phobia"]},
-            
-            # ADHD and Attention
-            {"id": "adhd-001", "name": "Attention Deficit Hyperactivity Disorder", "description": "Persistent inattention and/or hyperactivity-impulsivity", "categories": ["ICD11-6A05"], "source": "medical_db", "aliases": ["ADHD", "ADD", "attention deficit", "hyperactivity disorder", "attention problems"]},
-            {"id": "adhd-002", "name": "Attention Difficulties", "description": "Problems with focus and concentration", "categories": ["ICD11-6A05"], "source": "medical_db", "aliases": ["focus problems", "concentration issues", "distractibility", "attention span"]},
-            
-            # Depression and Mood
-            {"id": "dep-001", "name": "Major Depressive Disorder", "description": "Persistent depressed mood and loss of interest", "categories": ["ICD11-6A70"], "source": "medical_db", "aliases": ["MDD", "depression", "clinical depression", "major depression", "depressive disorder"]},
-            {"id": "dep-002", "name": "Bipolar Disorder", "description": "Alternating periods of mania and depression", "categories": ["ICD11-6A60"], "source": "medical_db", "aliases": ["BPD", "bipolar", "manic depression", "bipolar episodes", "mood swings"]},
-            {"id": "dep-003", "name": "Persistent Depressive Disorder", "description": "Chronic depressive symptoms for at least 2 years", "categories": ["ICD11-6A71"], "source": "medical_db", "aliases": ["dysthymia", "chronic depression", "persistent depression"]},
-            
-            # OCD and Related
-            {"id": "ocd-001", "name": "Obsessive-Compulsive Disorder", "description": "Recurrent obsessions and/or compulsions", "categories": ["ICD11-6B20"], "source": "medical_db", "aliases": ["OCD", "obsessive compulsive", "obsessions", "compulsions", "intrusive thoughts"]},
-            {"id": "ocd-002", "name": "Body Dysmorphic Disorder", "description": "Preoccupation with perceived defects in appearance", "categories": ["ICD11-6B21"], "source": "medical_db", "aliases": ["BDD", "body dysmorphia", "body image disorder"]},
-            
-            # Trauma and PTSD
-            {"id": "ptsd-001", "name": "Post-Traumatic Stress Disorder", "description": "Persistent symptoms following traumatic events", "categories": ["ICD11-6B40"], "source": "medical_db", "aliases": ["PTSD", "trauma response", "traumatic stress", "post traumatic", "combat stress"]},
-            {"id": "ptsd-002", "name": "Complex PTSD", "description": "PTSD with additional symptoms from prolonged trauma", "categories": ["ICD11-6B41"], "source": "medical_db", "aliases": ["C-PTSD", "CPTSD", "complex trauma", "complex PTSD"]},
-            {"id": "ptsd-003", "name": "Acute Stress Reaction", "description": "Immediate response to exceptional stressor", "categories": ["ICD11-6B41"], "source": "medical_db", "aliases": ["acute stress", "crisis reaction", "stress response"]},
-            
-            # Sleep Disorders
-            {"id": "sleep-001", "name": "Insomnia Disorder", "description": "Difficulty initiating or maintaining sleep", "categories": ["ICD11-7A00"], "source": "medical_db", "aliases": ["insomnia", "sleep problems", "sleeplessness", "can't sleep"]},
-            {"id": "sleep-002", "name": "Nightmare Disorder", "description": "Repeated disturbing dreams causing distress", "categories": ["ICD11-7A03"], "source": "medical_db", "aliases": ["nightmares", "bad dreams", "night terrors"]},
-            
-            # Eating Disorders
-            {"id": "eat-001", "name": "Anorexia Nervosa", "description": "Restriction of food intake leading to low body weight", "categories": ["ICD11-6B80"], "source": "medical_db", "aliases": ["anorexia", "restrictive eating", "eating disorder", "ED"]},
-            {"id": "eat-002", "name": "Bulimia Nervosa", "description": "Binge eating followed by compensatory behaviors", "categories": ["ICD11-6B81"], "source": "medical_db", "aliases": ["bulimia", "binge-purge", "eating disorder", "ED"]},
-            {"id": "eat-003", "name": "Binge Eating Disorder", "description": "Recurrent episodes of binge eating without compensation", "categories": ["ICD11-6B82"], "source": "medical_db", "aliases": ["BED", "compulsive overeating", "binge eating", "eating disorder", "ED"]},
-            
-            # Sexual Health
-            {"id": "sex-001", "name": "Sexual Desire Dysfunction", "description": "Persistent lack or loss of sexual desire", "categories": ["ICD11-6C70"], "source": "medical_db", "aliases": ["sexual dysfunction", "low libido", "lack of sexual interest", "sexual desire disorder", "sexual problems"]},
-            {"id": "sex-002", "name": "Sexual Arousal Dysfunction", "description": "Persistent difficulty with sexual arousal", "categories": ["ICD11-6C71"], "source": "medical_db", "aliases": ["arousal disorder", "sexual arousal difficulty", "sexual dysfunction"]},
-            {"id": "sex-003", "name": "Orgasmic Dysfunction", "description": "Persistent difficulty achieving orgasm", "categories": ["ICD11-6C72"], "source": "medical_db", "aliases": ["anorgasmia", "orgasm problems", "climax difficulties", "sexual dysfunction"]},
-            {"id": "sex-004", "name": "Premature Ejaculation", "description": "Persistent early ejaculation during sexual activity", "categories": ["ICD11-6C73"], "source": "medical_db", "aliases": ["PE", "early ejaculation", "rapid ejaculation", "sexual dysfunction"]},
-            {"id": "sex-005", "name": "Sexual Pain Disorders", "description": "Pain during sexual activity", "categories": ["ICD11-6C75"], "source": "medical_db", "aliases": ["dyspareunia", "vaginismus", "sexual pain", "painful intercourse", "sexual dysfunction"]},
-            
-            # Substance Use
-            {"id": "sub-001", "name": "Alcohol Use Disorder", "description": "Problematic pattern of alcohol use", "categories": ["ICD11-6C40"], "source": "medical_db", "aliases": ["alcoholism", "alcohol addiction", "alcohol dependence", "drinking problem"]},
-            {"id": "sub-002", "name": "Cannabis Use Disorder", "description": "Problematic pattern of cannabis use", "categories": ["ICD11-6C41"], "source": "medical_db", "aliases": ["marijuana addiction", "cannabis dependence", "weed addiction"]},
-            
-            # Common Symptoms
-            {"id": "sym-001", "name": "Fatigue", "description": "Persistent tiredness not relieved by rest", "categories": ["ICD11-MB23"], "source": "medical_db", "aliases": ["exhaustion", "tiredness", "low energy", "chronic fatigue"]},
-            {"id": "sym-002", "name": "Mood Swings", "description": "Rapid changes in emotional state", "categories": ["ICD11-6A60"], "source": "medical_db", "aliases": ["emotional instability", "mood changes", "emotional ups and downs"]},
-            {"id": "sym-003", "name": "Irritability", "description": "Increased sensitivity to frustration and anger", "categories": ["ICD11-6A70"], "source": "medical_db", "aliases": ["anger", "frustration", "short temper", "agitation"]},
-            {"id": "sym-004", "name": "Social Withdrawal", "description": "Avoiding social contact and isolation", "categories": ["ICD11-6A70"], "source": "medical_db", "aliases": ["isolation", "avoiding people", "social isolation", "withdrawal"]},
-        ]
-        
         # Search logic with comprehensive matching
         search_term = q.lower().strip()
-        filtered_symptoms = []
-        
-        print(f"🔍 Debug: Searching for '{search_term}'")
+        results, medical_db_count, custom_count = _search_intake(search_term, limit)
         
-        for symptom in enhanced_symptoms:
-            relevance_score = 0
-            
-            # Exact name match (highest priority)
-            if search_term == symptom["name"].lower():
-                relevance_score = 1.0
-                print(f"   ✓ Exact name match: {symptom['name']}")
-            # Name contains search term
-            elif search_term in symptom["name"].lower():
-                relevance_score = 0.9
-                print(f"   ✓ Name contains: {symptom['name']}")
-            # Alias exact match
-            elif any(search_term == alias.lower() for alias in symptom.get("aliases", [])):
-                relevance_score = 0.95
-                print(f"   ✓ Exact alias match: {symptom['name']}")
-            # Alias contains search term (THIS IS THE KEY FIX)
-            elif any(search_term in alias.lower() for alias in symptom.get("aliases", [])):
-                relevance_score = 0.8
-                matching_aliases = [alias for alias in symptom.get("aliases", []) if search_term in alias.lower()]
-                print(f"   ✓ Alias contains '{search_term}': {symptom['name']} (aliases: {matching_aliases})")
-            # Description contains search term
-            elif search_term in symptom["description"].lower():
-                relevance_score = 0.6
-                print(f"   ✓ Description contains: {symptom['name']}")
-            
-            # Word-level matching for partial searches (fallback)
-            if relevance_score == 0:
-                words = search_term.split()
-                word_matches = []
-                for word in words:
-                    if len(word) > 2:  # Only check meaningful words
-                        if (word in symptom["name"].lower() or 
-                            word in symptom["description"].lower() or
-                            any(word in alias.lower() for alias in symptom.get("aliases", []))):
-                            word_matches.append(word)
-                
-                if len(word_matches) == len(words):  # All words must match
-                    relevance_score = 0.5
-                    print(f"   ✓ All words match: {symptom['name']} (matched: {word_matches})")
-            
-            if relevance_score > 0:
-                symptom["relevance_score"] = relevance_score
-                filtered_symptoms.append(symptom)
-        
-        # Sort by relevance score
-        filtered_symptoms.sort(key=lambda x: x["relevance_score"], reverse=True)
-        results = filtered_symptoms[:limit]
-        
-        print(f"Found {len(results)} results for '{q}'")
+        logger.debug("Found %d intake symptoms for %r", len(results), q)
         
         return {
             "status": "success",
@@ -1398,8 +2064,8 @@ async def search_intake_symptoms(q: str, limit: int = 20):
                 "symptoms": results,
                 "total_found": len(results),
                 "search_query": q,
-                "medical_db_count": len([s for s in results if s.get("source") == "medical_db"]),
-                "custom_count": len([s for s in results if s.get("source") == "custom"]),
+                "medical_db_count": medical_db_count,
+                "custom_count": custom_count,
                 "search_method": "Enhanced Medical Database"
             },
             "metadata": {
@@ -1408,80 +2074,6 @@ async def search_intake_symptoms(q: str, limit: int = 20):
                 "total_searchable_conditions": "30+ comprehensive mental health conditions"
             }
         }
-        mock_symptoms = [
-            {
-                "id": "1",
-                "name": "Anxiety",
-                "description": "Feelings of worry, nervousness, or unease about something with an uncertain outcome",
-                "categories": ["ICD11-6B00", "ICD11-6B01"],
-                "source": "master",
-                "aliases": ["Anxiousness", "Worry", "Nervousness"]
-            },
-            {
-                "id": "2", 
-                "name": "Depressed Mood",
-                "description": "Persistent feelings of sadness, emptiness, or hopelessness",
-                "categories": ["ICD11-6A70", "ICD11-6A71"],
-                "source": "master",
-                "aliases": ["Sadness", "Low mood", "Melancholy"]
-            },
-            {
-                "id": "3",
-                "name": "Insomnia",
-                "description": "Difficulty falling asleep, staying asleep, or waking up too early",
-                "categories": ["ICD11-7A00"],
-                "source": "master",
-                "aliases": ["Sleep problems", "Can't sleep", "Sleeplessness"]
-            },
-            {
-                "id": "4",
-                "name": "Panic Attacks",
-                "description": "Sudden episodes of intense fear or anxiety with physical symptoms",
-                "categories": ["ICD11-6B01"],
-                "source": "master",
-                "aliases": ["Panic episodes", "Anxiety attacks"]
-            },
-            {
-                "id": "5",
-                "name": "Social Withdrawal",
-                "description": "Avoiding social interactions or isolating oneself from others",
-                "categories": ["ICD11-6A70", "ICD11-6A02"],
-                "source": "master",
-                "aliases": ["Isolation", "Avoiding people", "Social isolation"]
-            },
-            {
-                "id": "6",
-                "name": "Fatigue",
-                "description": "Persistent tiredness or lack of energy not relieved by rest",
-                "categories": ["ICD11-6A70", "ICD11-6A71", "ICD11-MB23"],
-                "source": "master",
-                "aliases": ["Tiredness", "Exhaustion", "Low energy"]
-            }
-        ]
-        
-        # Filter symptoms based on search query
-        search_term = q.lower()
-        filtered_symptoms = []
-        
-        for symptom in mock_symptoms:
-            if (search_term in symptom["name"].lower() or 
-                any(search_term in alias.lower() for alias in symptom["aliases"]) or
-                search_term in symptom["description"].lower()):
-                filtered_symptoms.append(symptom)
-        
-        return {
-            "status": "success",
-            "data": {
-                "symptoms": filtered_symptoms[:limit],
-                "total_found": len(filtered_symptoms),
-                "search_query": q,
-                "master_count": len([s for s in filtered_symptoms if s["source"] == "master"]),
-                "user_count": len([s for s in filtered_symptoms if s["source"] == "user"])
-            },
-            "metadata": {
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }
-        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Symptom search failed: {str(e)}")
 
@@ -1489,7 +2081,7 @@ async def search_intake_symptoms(q: str, limit: int = 20):
 async def create_user_symptom(symptom_data: dict):
     """Create a new custom symptom for the current doctor."""
     try:
-        custom_symptom_id = f"custom-{hash(str(symptom_data)) % 10000:04d}"
+        custom_symptom_id = f"custom-{_content_digest(symptom_data)}"
         
         return {
             "status": "success",
@@ -1527,7 +2119,7 @@ class SymptomData(BaseModel):
 async def add_patient_symptoms(patient_id: str, symptoms: List[SymptomData]):
     """Add symptoms to a patient (Stage 2)."""
     try:
-        print(f"Received symptoms data for patient {patient_id}: {[s.dict() for s in symptoms]}")
+        logger.debug("Received %d symptoms for patient %s", len(symptoms), patient_id)
         
         return {
             "status": "success",
@@ -1547,58 +2139,81 @@ async def add_patient_symptoms(patient_id: str, symptoms: List[SymptomData]):
         print(f"Error adding symptoms: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to add patient symptoms: {str(e)}")
 
+# Mock intake patient record; id and created_at are filled in per request
+_INTAKE_PATIENT_TEMPLATE = {
+    "name": "Test Patient",
+    "age": 35,
+    "sex": "Female",
+    "address": "123 Main Street, City, State",
+    "informants": {
+        "selection": ["Self", "Spouse"],
+        "other_details": None
+    },
+    "illness_duration": {
+        "value": 3,
+        "unit": "Months",
+        "formatted": "3 months"
+    },
+    "referred_by": "Dr. Smith",
+    "precipitating_factor": {
+        "narrative": "Job loss and family stress",
+        "tags": ["job_loss", "family_stress"]
+    },
+}
+
+_INTAKE_PATIENT_SYMPTOMS = [
+    {
+        "symptom_name": "Anxiety",
+        "severity": "Moderate",
+        "frequency": "Daily",
+        "duration": {"value": 2, "unit": "Months", "formatted": "2 months"},
+        "notes": "Worse in the mornings"
+    }
+]
+
 @app.get("/api/v1/intake/patients/{patient_id}")
 async def get_intake_patient(patient_id: str):
     """Get complete intake patient information including symptoms."""
     try:
-        # Mock patient data
-        mock_patient = {
-            "id": patient_id,
-            "name": "Test Patient",
-            "age": 35,
-            "sex": "Female",
-            "address": "123 Main Street, City, State",
-            "informants": {
-                "selection": ["Self", "Spouse"],
-                "other_details": None
-            },
-            "illness_duration": {
-                "value": 3,
-                "unit": "Months",
-                "formatted": "3 months"
-            },
-            "referred_by": "Dr. Smith",
-            "precipitating_factor": {
-                "narrative": "Job loss and family stress",
-                "tags": ["job_loss", "family_stress"]
-            },
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        
-        mock_symptoms = [
-            {
-                "symptom_name": "Anxiety",
-                "severity": "Moderate",
-                "frequency": "Daily",
-                "duration": {"value": 2, "unit": "Months", "formatted": "2 months"},
-                "notes": "Worse in the mornings"
-            }
-        ]
-        
+        timestamp = datetime.now(timezone.utc).isoformat()
         return {
             "status": "success",
             "data": {
-                "patient": mock_patient,
-                "symptoms": mock_symptoms,
-                "total_symptoms": len(mock_symptoms)
+                "patient": {"id": patient_id, **_INTAKE_PATIENT_TEMPLATE, "created_at": timestamp},
+                "symptoms": _INTAKE_PATIENT_SYMPTOMS,
+                "total_symptoms": len(_INTAKE_PATIENT_SYMPTOMS)
             },
             "metadata": {
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": timestamp
             }
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve patient: {str(e)}")
 
+STT_PROJECT_ID = "synapse-product-1"
+
+# The STT self-test success payload never changes; serialize it once
+_STT_TEST_OK_BODY = _static_json({
+    "status": "success", 
+    "data": {
+        "stt_service": "available",
+        "project_id": STT_PROJECT_ID,
+        "supported_languages": ["en-IN", "mr-IN", "hi-IN"],
+        "mental_health_optimized": True,
+        "credentials_valid": True,
+        "client_initialized": True,
+        "config": {
+            "model": "latest_long",
+            "sample_rate": 48000,
+            "encoding": "WEBM_OPUS",
+            "enable_word_confidence": True,
+            "enable_word_time_offsets": True,
+            "streaming_support": True
+        }
+    },
+    "message": "Google Cloud Speech-to-Text service is ready for real-time mental health consultations"
+})
+
 @app.get("/api/v1/consultation/test")
 async def test_stt_service():
     """
@@ -1606,40 +2221,13 @@ async def test_stt_service():
     """
     try:
         # Test basic client initialization
-        project_id = "synapse-product-1"
+        project_id = STT_PROJECT_ID
         
         # Test actual speech client initialization (if available)
         if speech_client is None:
             raise Exception("Google Cloud Speech client not initialized")
-        test_client = speech_client
         
-        # Create a simple recognition config for testing
-        config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=16000,
-            language_code="en-US",
-        )
-        
-        return {
-            "status": "success", 
-            "data": {
-                "stt_service": "available",
-                "project_id": project_id,
-                "supported_languages": ["en-IN", "mr-IN", "hi-IN"],
-                "mental_health_optimized": True,
-                "credentials_valid": True,
-                "client_initialized": True,
-                "config": {
-                    "model": "latest_long",
-                    "sample_rate": 48000,
-                    "encoding": "WEBM_OPUS",
-                    "enable_word_confidence": True,
-                    "enable_word_time_offsets": True,
-                    "streaming_support": True
-                }
-            },
-            "message": "Google Cloud Speech-to-Text service is ready for real-time mental health consultations"
-        }
+        return Response(content=_STT_TEST_OK_BODY, media_type="application/json")
         
     except Exception as e:
         return {
@@ -1653,48 +2241,42 @@ async def test_stt_service():
             }
         }
 
-@app.post("/api/v1/consultation/start")
-async def start_consultation_session(session_data: dict):
-    """Mock consultation session start endpoint with STT integration."""
-    try:
-        session_id = f"CS-{datetime.now().strftime('%Y%m%d')}-{hash(str(session_data)) % 10000:04d}"
-        
-        return {
-            "status": "success",
-            "data": {
-                "session_id": session_id,
-                "patient_name": session_data.get("patient_name", "Test Patient"),
-                "started_at": datetime.now(timezone.utc).isoformat(),
-                "stt_session": {
-                    "enabled": True,
-                    "languages": ["mr-IN", "en-IN", "hi-IN"],
-                    "model": "latest_long",
-                    "mental_health_optimized": True
-                },
-                "websocket_url": f"ws://localhost:8000/ws/consultation/{session_id}"
-            },
-            "message": "Consultation session started with STT enabled"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to start consultation: {str(e)}")
-
-@app.post("/api/v1/consultation/{session_id}/stop")
-async def stop_consultation_session(session_id: str):
-    """Mock consultation session stop endpoint."""
-    return {
-        "status": "success",
-        "data": {
-            "session_id": session_id,
-            "ended_at": datetime.now(timezone.utc).isoformat(),
-            "duration_minutes": 15,
-            "stt_summary": {
-                "total_words": 450,
-                "languages_detected": ["english", "marathi"],
-                "confidence_average": 0.94
-            }
-        },
-        "message": "Consultation session completed successfully"
-    }
+# Async STT client for the consultation WebSocket. Created on first use so its gRPC channel
+# binds to the serving event loop rather than whichever loop (if any) imported this module.
+_speech_async_client: Optional[speech.SpeechAsyncClient] = None
+
+def get_speech_async_client() -> speech.SpeechAsyncClient:
+    global _speech_async_client
+    if _speech_async_client is None:
+        _speech_async_client = speech.SpeechAsyncClient(credentials=credentials)
+    return _speech_async_client
+
+async def _on_pause_recording(websocket: WebSocket, session_id: str) -> None:
+    logger.info("Recording paused for session %s", session_id)
+    await send_json_fast(websocket, {
+        "type": "recording_paused",
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    })
+
+async def _on_resume_recording(websocket: WebSocket, session_id: str) -> None:
+    logger.info("Recording resumed for session %s", session_id)
+    await send_json_fast(websocket, {
+        "type": "recording_resumed",
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    })
+
+async def _on_ping(websocket: WebSocket, session_id: str) -> None:
+    await send_json_fast(websocket, {
+        "type": "pong",
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    })
+
+# Consultation control messages by "type"; "stop_recording" ends the receive loop itself
+CONSULTATION_CONTROL_HANDLERS: dict[str, Callable[[WebSocket, str], Awaitable[None]]] = {
+    "pause_recording": _on_pause_recording,
+    "resume_recording": _on_resume_recording,
+    "ping": _on_ping,
+}
 
 @app.websocket("/ws/consultation/{session_id}")  # Reference-based STT endpoint
 async def websocket_consultation_endpoint(websocket: WebSocket, session_id: str):
@@ -1703,16 +2285,14 @@ async def websocket_consultation_endpoint(websocket: WebSocket, session_id: str)
     Adapted from Google's official streaming STT example for medical use.
     """
     await websocket.accept()
-    print(f"WebSocket connected for session: {session_id}")
+    logger.info("WebSocket connected for session: %s", session_id)
     
     # Initialize variables for cleanup
-    speech_client = None
-    stop_event = None
-    streaming_thread = None
+    streaming_task = None
     
     try:
         # Send welcome message
-        await websocket.send_json({
+        await send_json_fast(websocket, {
             "type": "connected", 
             "message": "Connected to SynapseAI Real-time Speech Recognition",
             "session_id": session_id,
@@ -1723,58 +2303,15 @@ async def websocket_consultation_endpoint(websocket: WebSocket, session_id: str)
             }
         })
         
-        # Use the globally initialized speech client
-        import sys
-        current_module = sys.modules[__name__]
-        module_speech_client = getattr(current_module, 'speech_client', None)
-        print(f"🔍 Checking module speech_client: {module_speech_client is not None}")
-        print(f"🔍 Local speech_client: {speech_client is not None}")
-        if module_speech_client is None:
+        # The module-level client doubles as the credentials check for the async client
+        if speech_client is None:
             raise Exception("Google Cloud Speech client not initialized - check credentials")
         
-        # Mental health specific terms for enhanced recognition
-        mental_health_phrases = [
-            "anxiety", "depression", "stress", "panic", "therapy", "counseling", "medication",
-            "mood", "sleep", "insomnia", "worry", "fear", "trauma", "PTSD", "bipolar",
-            "mindfulness", "meditation", "cognitive behavioral therapy", "CBT", "psychotherapy",
-            "mental health", "psychiatric", "antidepressant", "anxiolytic", "mood stabilizer",
-            "चिंता", "तणाव", "उदासीनता", "मानसिक आरोग्य", "थेरपी", "औषध",
-            "झोप", "घबराट", "मूड", "मन", "भावना", "चिकित्सा"
-        ]
-        
-        # Configure streaming recognition for mental health (Hindi/Marathi/English)
-        config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=16000,
-            language_code="mr-IN",  # Primary: Marathi (India)
-            alternative_language_codes=["en-IN", "hi-IN"],  # English (India), Hindi (India)
-            model="latest_long",  # Best for long-form medical conversations
-            use_enhanced=True,  # Enhanced model for better accuracy
-            enable_automatic_punctuation=True,  # Medical transcription needs punctuation
-            enable_word_confidence=True,  # Track confidence for medical accuracy
-            # Mental health speech contexts
-            speech_contexts=[
-                speech.SpeechContext(
-                    phrases=mental_health_phrases,
-                    boost=15.0  # Boost mental health terminology
-                )
-            ]
-        )
-        
-        print(f"🔧 Using Google STT config: encoding=LINEAR16, rate=16000, lang=mr-IN (primary), alt=[en-IN, hi-IN], model=latest_long")
-        import sys
-        sys.stdout.flush()
-        
-        streaming_config = speech.StreamingRecognitionConfig(
-            config=config,
-            interim_results=True,
-            single_utterance=False
-        )
-        
-        print(f"Google Cloud Speech-to-Text initialized for session {session_id}")
+        logger.info("Google Cloud Speech-to-Text initialized for session %s (lang=%s, model=%s)",
+                    session_id, STT_CONFIG.language_code, STT_CONFIG.model)
         
         # Send confirmation of STT readiness with language info
-        await websocket.send_json({
+        await send_json_fast(websocket, {
             "type": "stt_ready",
             "message": "Google Cloud Speech-to-Text ready for mental health consultation",
             "languages": {
@@ -1786,186 +2323,89 @@ async def websocket_consultation_endpoint(websocket: WebSocket, session_id: str)
             "timestamp": datetime.now(timezone.utc).isoformat()
         })
         
-        # Streaming recognition setup using a background thread and a queue
-        audio_queue: queue.Queue[bytes] = queue.Queue(maxsize=200)
-        stop_event = threading.Event()
-        
-        loop = asyncio.get_running_loop()
+        # Streaming recognition runs as a task on the event loop, fed by an asyncio queue
+        audio_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=200)
+        async_client = get_speech_async_client()
         
-        def requests_generator():
-            # Generate audio requests only (config passed separately)
-            print(f"🎯 Starting audio request generator...")
-            print(f"🔍 Queue initial size: {audio_queue.qsize()}")
-            import sys
-            sys.stdout.flush()
-            
-            silence_chunk = b"\x00\x00" * 800  # 50ms of 16kHz 16-bit PCM
-            requests_sent = 0
-            last_real_audio_time = time.time()
+        async def request_generator():
+            """Generate requests: streaming_config first, then audio chunks."""
+            # Send config as first request (reference pattern)
+            yield speech.StreamingRecognizeRequest(streaming_config=STT_STREAMING_CONFIG)
             
-            # CRITICAL: Wait for real audio before starting stream
-            print(f"⏳ Waiting for real audio before starting stream...")
-            sys.stdout.flush()
+            # Then send audio chunks
+            requests_sent = 1  # Already sent config
             
-            # Wait up to 10 seconds for first real audio chunk
-            first_audio_received = False
-            wait_start = time.time()
-            while not first_audio_received and not stop_event.is_set():
-                if time.time() - wait_start > 10.0:
-                    print(f"⚠️ Timeout waiting for audio, starting with silence")
-                    break
+            while True:
                 try:
-                    first_chunk = audio_queue.get(timeout=0.5)
-                    if first_chunk and len(first_chunk) > 0:
-                        print(f"🎉 First real audio received: {len(first_chunk)} bytes!")
-                        sys.stdout.flush()
-                        # Send the first real audio chunk
-                        yield speech.StreamingRecognizeRequest(audio_content=first_chunk)
-                        requests_sent += 1
-                        last_real_audio_time = time.time()
-                        first_audio_received = True
-                        print(f"✅ First real audio sent (#{requests_sent})")
-                        sys.stdout.flush()
-                except queue.Empty:
+                    # Get audio chunk
+                    audio_data = await asyncio.wait_for(audio_queue.get(), timeout=0.1)
+                except asyncio.TimeoutError:
+                    # Send silence to keep stream alive
+                    yield SILENCE_REQUEST
+                    requests_sent += 1
                     continue
-            
-            # If no real audio received, send initial silence
-            if not first_audio_received:
-                initial_request = speech.StreamingRecognizeRequest(audio_content=silence_chunk)
-                yield initial_request
-                requests_sent += 1
-                print(f"✅ Initial silence sent (#{requests_sent})")
-                sys.stdout.flush()
-            
-            # Simple continuous streaming - prioritize real audio, minimal silence
-            while not stop_event.is_set():
-                try:
-                    # Get audio with longer timeout to avoid spam
-                    chunk: bytes = audio_queue.get(timeout=0.2)
-                    if chunk and len(chunk) > 0:
-                        # Send real audio immediately
-                        request = speech.StreamingRecognizeRequest(audio_content=chunk)
-                        yield request
-                        requests_sent += 1
-                        last_real_audio_time = time.time()
-                        queue_remaining = audio_queue.qsize()
-                        print(f"📤 Streaming audio to Google: {len(chunk)} bytes (request #{requests_sent}), queue: {queue_remaining}")
-                        sys.stdout.flush()
-                except queue.Empty:
-                    # Send minimal silence only when necessary
-                    current_time = time.time()
-                    time_since_audio = current_time - last_real_audio_time
-                    
-                    if time_since_audio < 3.0:  # Only send silence for 3 seconds after last audio
-                        request = speech.StreamingRecognizeRequest(audio_content=silence_chunk)
-                        yield request
-                        requests_sent += 1
-                        if requests_sent % 30 == 0:  # Less spam
-                            print(f"🔇 Silence keepalive (request #{requests_sent})")
-                            sys.stdout.flush()
-                    
-                    time.sleep(0.1)  # Brief delay
-            
-            print(f"🏁 Audio request generator ended. Total requests sent: {requests_sent}")
-        
-        def run_streaming():
-            print(f"🚀 SIMPLE STT Stream for {session_id}")
-            import sys
-            sys.stdout.flush()
-            
-            # Get speech client
-            current_module = sys.modules[__name__]
-            module_speech_client = getattr(current_module, 'speech_client', None)
-            if module_speech_client is None:
-                print("❌ No speech client available")
-                return
                 
+                # Drain whatever else is queued into one frame, waiting briefly for a short one
+                frame = [audio_data]
+                frame_bytes = len(audio_data)
+                flush_at = time.monotonic() + STT_FRAME_MAX_DELAY
+                while frame_bytes < STT_FRAME_MAX_BYTES:
+                    try:
+                        audio_data = audio_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        remaining = flush_at - time.monotonic()
+                        if frame_bytes >= STT_FRAME_MIN_BYTES or remaining <= 0:
+                            break
+                        try:
+                            audio_data = await asyncio.wait_for(audio_queue.get(), timeout=remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    frame.append(audio_data)
+                    frame_bytes += len(audio_data)
+                
+                if frame_bytes:
+                    yield speech.StreamingRecognizeRequest(
+                        audio_content=frame[0] if len(frame) == 1 else b"".join(frame)
+                    )
+                    requests_sent += 1
+                    if requests_sent % 100 == 0:
+                        logger.info("STT session %s: %d requests sent", session_id, requests_sent)
+        
+        async def run_streaming():
             # Stream parameters for long therapy sessions (20+ minutes)
             max_stream_duration = 240  # 4 minutes - restart streams regularly 
             max_requests_per_stream = 1000  # High limit for long sessions
-            stream_start_time = time.time()  # Track when this stream started
-            print(f"🕐 Stream started at {stream_start_time}, will restart after {max_stream_duration}s or {max_requests_per_stream} requests")
-            sys.stdout.flush()
-            
-            # WORKING PATTERN: Based on successful implementation
-            def request_generator():
-                """Generate requests: streaming_config first, then audio chunks."""
-                print(f"🎯 Request generator started")
-                sys.stdout.flush()
-                
-                # Send config as first request (reference pattern)
-                yield speech.StreamingRecognizeRequest(streaming_config=streaming_config)
-                print(f"✅ Streaming config sent as first request")
-                sys.stdout.flush()
-                
-                # Then send audio chunks
-                requests_sent = 1  # Already sent config
-                silence = b"\x00\x00" * 800  # 50ms silence
-                
-                while not stop_event.is_set():
-                    try:
-                        # Get audio chunk
-                        audio_data = audio_queue.get(timeout=0.1)
-                        if audio_data and len(audio_data) > 0:
-                            yield speech.StreamingRecognizeRequest(audio_content=audio_data)
-                            requests_sent += 1
-                            if requests_sent % 20 == 0:
-                                print(f"📤 Audio chunk sent: {len(audio_data)} bytes (#{requests_sent})")
-                                sys.stdout.flush()
-                    except queue.Empty:
-                        # Send silence to keep stream alive
-                        yield speech.StreamingRecognizeRequest(audio_content=silence)
-                        requests_sent += 1
-                        time.sleep(0.05)
-                
-                print(f"🏁 Request generator ended: {requests_sent} total")
-                sys.stdout.flush()
-            
+            stream_start_time = time.monotonic()  # Track when this stream started
+            # Config travels as the first request; the async client has no config helper
+            responses = await async_client.streaming_recognize(requests=request_generator())
             try:
-                print(f"📞 Calling streaming_recognize...")
-                sys.stdout.flush()
-                
-                # Use the reference pattern: config first, then audio requests
-                responses = module_speech_client.streaming_recognize(
-                    config=streaming_config,
-                    requests=request_generator()
-                )
-                
-                print(f"📡 Processing STT responses...")
-                sys.stdout.flush()
-                
                 # Process responses with restart logic
                 requests_sent = 0  # Track requests in this response loop
-                for response in responses:
-                    if stop_event.is_set():
-                        break
-                    
+                async for response in responses:
                     requests_sent += 1
                     
                     # Check if we need to restart the stream for long sessions
-                    current_time = time.time()
+                    current_time = time.monotonic()
                     stream_duration = current_time - stream_start_time
                     
                     if (stream_duration > max_stream_duration or 
                         requests_sent > max_requests_per_stream):
-                        print(f"🔄 Stream restart needed for long session: duration={stream_duration:.1f}s, requests={requests_sent}")
-                        print(f"🎯 This is normal for therapy sessions longer than {max_stream_duration/60:.1f} minutes")
-                        sys.stdout.flush()
+                        logger.info("Restarting STT stream for session %s: duration=%.1fs, responses=%d",
+                                    session_id, stream_duration, requests_sent)
                         break  # This will restart the stream
                     
                     if hasattr(response, 'error') and response.error:
                         error_code = getattr(response.error, 'code', 'no_code')
                         error_message = getattr(response.error, 'message', 'no_message') 
                         error_details = getattr(response.error, 'details', 'no_details')
-                        print(f"❌ STT ERROR: code={error_code}, message='{error_message}', details='{error_details}'")
+                        logger.error("STT error for session %s: code=%s, message=%r, details=%r",
+                                     session_id, error_code, error_message, error_details)
                         
                         # Handle specific errors that require restart
                         if error_code in [11, 3, 4]:  # DEADLINE_EXCEEDED, INVALID_ARGUMENT, DEADLINE_EXCEEDED
-                            print(f"🔄 Restarting stream due to error {error_code}")
-                            sys.stdout.flush()
+                            logger.info("Restarting STT stream for session %s due to error %s", session_id, error_code)
                             break  # Restart stream
                         
-                        sys.stdout.flush()
                         continue
                     
                     if not response.results:
@@ -1980,158 +2420,128 @@ async def websocket_consultation_endpoint(websocket: WebSocket, session_id: str)
                     confidence = getattr(result.alternatives[0], 'confidence', 0.0)
                     
                     if transcript:  # Only send non-empty transcripts
-                        print(f"✅ {'FINAL' if is_final else 'interim'}: '{transcript}'")
-                        sys.stdout.flush()
+                        logger.debug("STT %s result for session %s (%d chars)",
+                                     "final" if is_final else "interim", session_id, len(transcript))
                         
                         # Send to frontend
-                        asyncio.run_coroutine_threadsafe(
-                            websocket.send_json({
-                                                "type": "transcription",
-                                                "data": {
-                                    "type": "final" if is_final else "interim",
-                                                    "transcript": transcript,
-                                                    "confidence": round(confidence, 2),
-                                                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                                    "source": "google_streaming",
-                                    "language_detected": config.language_code,
-                                                    "mental_health_optimized": True
-                                                }
-                            }),
-                            loop,
-                        )
-                
-                print(f"🏁 STT completed for session {session_id}")
+                        await send_json_fast(websocket, {
+                            "type": "transcription",
+                            "data": {
+                                "type": "final" if is_final else "interim",
+                                "transcript": transcript,
+                                "confidence": round(confidence, 2),
+                                "timestamp": _utc_now_iso(),
+                                "source": "google_streaming",
+                                "language_detected": STT_CONFIG.language_code,
+                                "mental_health_optimized": True
+                            }
+                        })
                 
-            except Exception as e:
-                print(f"❌ STT failed: {type(e).__name__}: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                sys.stdout.flush()
+                logger.info("STT stream completed for session %s", session_id)
+            finally:
+                # Closes the gRPC stream (and its request generator) on restart or cancellation
+                responses.cancel()
         
         # Start STT streaming with automatic restart capability
-        def run_streaming_with_restart():
+        # Runs until the WebSocket closes (the cleanup below cancels it); a stream that ends
+        # normally is always replaced, even if the audio queue is momentarily empty
+        async def run_streaming_with_restart():
             restart_count = 0
-            while not stop_event.is_set():
+            error_count = 0  # Consecutive failed streams
+            while True:
                 restart_count += 1
-                print(f"🚀 STT STREAM #{restart_count} STARTING for session {session_id}")
-                import sys
-                sys.stdout.flush()
+                logger.info("Starting STT stream #%d for session %s", restart_count, session_id)
                 
                 try:
-                    run_streaming()
-                    
-                    # If we reach here without exception, check if we should continue
-                    if stop_event.is_set():
-                        print(f"🛑 Stop event set, ending STT for session {session_id}")
-                        break
-                    
-                    # Check if there's still audio to process
-                    if audio_queue.qsize() > 0:
-                        print(f"🔄 Audio remaining, auto-restarting STT stream #{restart_count + 1}")
-                        print(f"🎭 Continuing therapy session - this is normal for 20+ minute sessions")
-                        time.sleep(0.5)  # Brief pause before restart
-                        continue
-                    else:
-                        print(f"🏁 No more audio, ending STT for session {session_id}")
-                        break
+                    await run_streaming()
+                    error_count = 0
+                    logger.info("STT stream ended for session %s, restarting", session_id)
+                    await asyncio.sleep(0.5)  # Brief pause before restart
+                    continue
                         
                 except Exception as stream_error:
-                    print(f"❌ STT stream error (attempt #{restart_count}): {stream_error}")
+                    error_count += 1
                     
                     # Check for specific restart conditions - common in long therapy sessions
                     error_str = str(stream_error).lower()
                     if any(keyword in error_str for keyword in ['deadline', 'timeout', 'limit', 'exceeded', 'duration']):
-                        print(f"🔄 Detected stream limit (normal for long sessions), restarting STT stream #{restart_count + 1}")
-                        print(f"💬 This restart ensures stable transcription during therapy sessions")
-                        time.sleep(1)
+                        logger.info("STT stream limit hit for session %s (attempt #%d), restarting: %s",
+                                    session_id, restart_count, stream_error)
+                        await asyncio.sleep(1)
                         continue
                     else:
                         # Other errors might be more serious
-                        print(f"💥 Serious STT error: {stream_error}")
-                        import traceback
-                        traceback.print_exc()
-                        time.sleep(2)
-                        if restart_count < 5:  # Max 5 restart attempts
+                        logger.exception("STT stream error for session %s (attempt #%d)", session_id, restart_count)
+                        await asyncio.sleep(2)
+                        if error_count < 5:  # Max 5 consecutive failed attempts
                             continue
                         else:
-                            print(f"🚫 Max restart attempts reached for session {session_id}")
+                            logger.error("Max STT restart attempts reached for session %s", session_id)
                             break
                     
-                    sys.stdout.flush()
-                
-            print(f"🔚 STT streaming ended for session {session_id} after {restart_count} attempts")
+            logger.info("STT streaming ended for session %s after %d attempts", session_id, restart_count)
         
-        streaming_thread = threading.Thread(target=run_streaming_with_restart, daemon=True)
-        streaming_thread.start()
-        print(f"🎤 STT thread with auto-restart started for session {session_id}")
-        import sys
-        sys.stdout.flush()  # Force immediate output
+        streaming_task = asyncio.create_task(run_streaming_with_restart())
         
-        # Main WebSocket loop
-        while True:
+        silent_run = 0  # consecutive near-silent chunks
+        held_silent: Optional[bytes] = None  # latest skipped chunk, sent ahead of the next loud one
+        
+        def enqueue_audio(chunk: bytes) -> None:
             try:
-                # Wait for data from frontend
-                data = await asyncio.wait_for(websocket.receive(), timeout=10.0)
-                
-                if "bytes" in data:
-                    # Handle audio data (binary PCM 16-bit little endian)
-                    audio_data = data["bytes"]
-                    if len(audio_data) > 0:
-                        # Push to streaming queue
-                        try:
-                            audio_queue.put_nowait(audio_data)
-                            queue_size = audio_queue.qsize()
-                            print(f"Received audio chunk: {len(audio_data)} bytes, queue size: {queue_size}")
-                            import sys
-                            sys.stdout.flush()
-                        except queue.Full:
-                            # Drop if queue is full to avoid backpressure
-                            print(f"⚠️ Audio queue full, dropping {len(audio_data)} bytes")
-                            pass
-                
-                elif "text" in data:
-                    # Handle control messages
-                    try:
-                        message = json.loads(data["text"])
-                        message_type = message.get("type")
-                        
-                        if message_type == "stop_recording":
-                            stop_event.set()
-                            break
-                        elif message_type == "pause_recording":
-                            print(f"Recording paused for session {session_id}")
-                            await websocket.send_json({
-                                "type": "recording_paused",
-                                "timestamp": datetime.now(timezone.utc).isoformat()
-                            })
-                        elif message_type == "resume_recording":
-                            print(f"Recording resumed for session {session_id}")
-                            await websocket.send_json({
-                                "type": "recording_resumed",
-                                "timestamp": datetime.now(timezone.utc).isoformat()
-                            })
-                        elif message_type == "ping":
-                            await websocket.send_json({
-                                "type": "pong",
-                                "timestamp": datetime.now(timezone.utc).isoformat()
-                            })
-                    except json.JSONDecodeError:
-                        print(f"Invalid JSON message received for session {session_id}")
-                    
-            except asyncio.TimeoutError:
-                # Send heartbeat to keep connection alive
-                await websocket.send_json({
-                    "type": "heartbeat",
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-                continue
+                audio_queue.put_nowait(chunk)
+                logger.debug("Received audio chunk: %d bytes, queue size: %d", len(chunk), audio_queue.qsize())
+            except asyncio.QueueFull:
+                # Drop if queue is full to avoid backpressure
+                logger.warning("Audio queue full for session %s, dropping %d bytes", session_id, len(chunk))
+        
+        # Main WebSocket loop; idle connections are kept alive by the server's protocol-level
+        # ping/pong (uvicorn --ws-ping-interval / --ws-ping-timeout), not by app heartbeats
+        while True:
+            # Wait for data from frontend
+            data = await websocket.receive()
+            if data["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(data.get("code", 1000))
+            
+            if "bytes" in data:
+                # Handle audio data (binary PCM 16-bit little endian)
+                audio_data = data["bytes"]
+                if not audio_data:
+                    continue
+                if STT_SILENCE_RMS_THRESHOLD > 0 and _is_silent_pcm(audio_data):
+                    silent_run += 1
+                    if silent_run > STT_SILENCE_HANGOVER_CHUNKS:
+                        # Sustained silence: let the generator's keepalive stand in for it
+                        held_silent = audio_data
+                        continue
+                else:
+                    if held_silent is not None:
+                        logger.debug("Skipped %d silent audio chunks for session %s",
+                                     silent_run - STT_SILENCE_HANGOVER_CHUNKS - 1, session_id)
+                        enqueue_audio(held_silent)  # Lead-in for the onset
+                        held_silent = None
+                    silent_run = 0
+                enqueue_audio(audio_data)
+            
+            elif "text" in data:
+                # Handle control messages
+                try:
+                    message_type = _json_loads(data["text"]).get("type")
+                except json.JSONDecodeError:
+                    logger.warning("Invalid JSON message received for session %s", session_id)
+                    continue
                 
+                if message_type == "stop_recording":
+                    break
+                handler = CONSULTATION_CONTROL_HANDLERS.get(message_type)
+                if handler:
+                    await handler(websocket, session_id)
+
     except WebSocketDisconnect:
-        print(f"WebSocket disconnected for session: {session_id}")
+        logger.info("WebSocket disconnected for session: %s", session_id)
     except Exception as e:
-        print(f"WebSocket error for session {session_id}: {str(e)}")
+        logger.error("WebSocket error for session %s: %s", session_id, e)
         try:
-            await websocket.send_json({
+            await send_json_fast(websocket, {
                 "type": "error",
                 "message": f"Connection error: {str(e)}"
             })
@@ -2139,16 +2549,95 @@ async def websocket_consultation_endpoint(websocket: WebSocket, session_id: str)
             pass
     finally:
         # Cleanup
-        if stop_event:
-            stop_event.set()
-        try:
-            if streaming_thread and streaming_thread.is_alive():
-                streaming_thread.join(timeout=1.5)
-        except Exception:
-            pass
-        print(f"WebSocket connection closed for session: {session_id}")# This code goes into simple_main.py
+        if streaming_task and not streaming_task.done():
+            streaming_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await asyncio.wait_for(streaming_task, timeout=1.5)
+        logger.info("WebSocket connection closed for session: %s", session_id)# This code goes into simple_main.py
 # Add this endpoint after the existing /ws/consultation endpoint
 
+@functools.lru_cache(maxsize=1)
+def _get_transcribe_stt():
+    """
+    (Speech V2 async client, config request) for /ws/transcribe, built on first connection
+    so the client binds to the serving event loop. Credentials, the gRPC channel and the
+    streaming config are shared by every session; a failure is not cached, so the next
+    connection retries.
+    """
+    from google.cloud import speech_v2
+    from app.core.config import get_settings
+    
+    settings = get_settings()
+    
+    # Create credentials
+    v2_credentials = service_account.Credentials.from_service_account_file(
+        settings.GOOGLE_APPLICATION_CREDENTIALS,
+        scopes=['https://www.googleapis.com/auth/cloud-platform']
+    )
+    
+    client = speech_v2.SpeechAsyncClient(credentials=v2_credentials)
+    
+    # Configure recognition (Speech V2 API)
+    # Note: AutoDetectDecodingConfig doesn't work well with WebM/Opus
+    # Frontend will send LINEAR16 PCM audio (16kHz, mono)
+    recognition_config = speech_v2.RecognitionConfig(
+        explicit_decoding_config=speech_v2.ExplicitDecodingConfig(
+            encoding=speech_v2.ExplicitDecodingConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=16000,  # Standard for speech recognition
+            audio_channel_count=1  # Mono
+        ),
+        language_codes=settings.GOOGLE_STT_ALTERNATE_LANGUAGES,  # All languages equal (hi-IN, mr-IN, en-IN)
+        model=settings.GOOGLE_STT_MODEL
+        # Note: Default recognizer (_) doesn't support advanced features like punctuation
+    )
+    print(f"📋 Recognition config: LINEAR16 @ 16kHz, model={settings.GOOGLE_STT_MODEL}, languages={settings.GOOGLE_STT_ALTERNATE_LANGUAGES}")
+    
+    streaming_config = speech_v2.StreamingRecognitionConfig(
+        config=recognition_config,
+        streaming_features=speech_v2.StreamingRecognitionFeatures(
+            interim_results=settings.GOOGLE_STT_INTERIM_RESULTS
+        )
+    )
+    
+    # First request of every stream
+    # Note: Speech V2 API requires 'global' location for streaming recognition
+    config_request = speech_v2.StreamingRecognizeRequest(
+        recognizer=f"projects/{settings.GOOGLE_CLOUD_PROJECT}/locations/global/recognizers/_",
+        streaming_config=streaming_config
+    )
+    return client, config_request
+
+def _drop_superseded_interims(batch: list[dict]) -> list[dict]:
+    """
+    Drop interim transcripts that are directly followed by another transcript in `batch`.
+    The client replaces its interim line on every result, so those would never be seen.
+    """
+    kept = []
+    for i, payload in enumerate(batch):
+        if payload.get("is_final") is False and i + 1 < len(batch) and "transcript" in batch[i + 1]:
+            continue
+        kept.append(payload)
+    return kept
+
+# Client-facing text for Speech API errors, by keyword in priority order
+_STT_ERROR_MESSAGES = {
+    "credentials": "Authentication error with speech service. Please contact support.",
+    "quota": "Speech service quota exceeded. Please try again later.",
+    "network": "Network error connecting to speech service. Please check your connection.",
+    "connection": "Network error connecting to speech service. Please check your connection.",
+    "encoding": "Audio format error. Please try refreshing the page.",
+    "format": "Audio format error. Please try refreshing the page.",
+}
+_STT_ERROR_KEYWORDS_RE = re.compile("|".join(_STT_ERROR_MESSAGES), re.IGNORECASE)
+
+def _stt_error_user_message(error_msg: str) -> str:
+    """One scan for every keyword; the highest-priority keyword present picks the message."""
+    found = {keyword.lower() for keyword in _STT_ERROR_KEYWORDS_RE.findall(error_msg)}
+    for keyword, message in _STT_ERROR_MESSAGES.items():
+        if keyword in found:
+            return message
+    return "Transcription service error. Please try again."
+
 @app.websocket("/ws/transcribe")
 async def vertex_ai_transcribe_websocket(websocket: WebSocket):
     """
@@ -2161,300 +2650,306 @@ async def vertex_ai_transcribe_websocket(websocket: WebSocket):
     token = None
     session_id = None
     try:
-        query_params = dict(websocket.query_params)
+        query_params = websocket.query_params  # QueryParams.get() reads it directly; no dict copy
         token = query_params.get('token')
         session_id = query_params.get('session_id', 'test-session')
         
         if not token:
-            await websocket.send_json({"error": "No token provided"})
+            await send_json_fast(websocket, {"error": "No token provided"})
             await websocket.close(code=1008)
             return
         
         # Validate JWT token
         try:
-            payload = jwt_manager.verify_token(token, token_type="access")
+            payload = _verify_access_token(token)
             user_id = payload.get("sub")
             user_email = payload.get("email")
-            print(f"✅ WebSocket authenticated: {user_email} ({user_id})")
+            logger.info("WebSocket authenticated: %s (%s)", user_email, user_id)
         except HTTPException as e:
             error_msg = getattr(e, 'detail', str(e))
-            print(f"❌ JWT validation failed (HTTPException): {error_msg}")
-            await websocket.send_json({"error": error_msg})
+            logger.warning("JWT validation failed (HTTPException): %s", error_msg)
+            await send_json_fast(websocket, {"error": error_msg})
             await websocket.close(code=1008)
             return
         except Exception as e:
             error_msg = str(e) if str(e) else type(e).__name__
-            print(f"❌ JWT validation failed (Exception): {error_msg}")
-            await websocket.send_json({"error": "Invalid or expired token"})
+            logger.warning("JWT validation failed (Exception): %s", error_msg)
+            await send_json_fast(websocket, {"error": "Invalid or expired token"})
             await websocket.close(code=1008)
             return
         
         # Send connection confirmation
-        await websocket.send_json({
+        await send_json_fast(websocket, {
             "status": "connected",
             "message": "Vertex AI STT ready",
             "session_id": session_id
         })
         
-        # Initialize Vertex AI Speech client
+        # Initialize Vertex AI Speech client (shared across connections)
         from google.cloud import speech_v2 as speech
-        from google.oauth2 import service_account
-        from app.core.config import get_settings
-        
-        settings = get_settings()
+        client, config_request = _get_transcribe_stt()
+        silence_request = speech.StreamingRecognizeRequest(audio=SILENCE_50MS)  # Same LINEAR16 16kHz format
         
-        # Create credentials
-        credentials = service_account.Credentials.from_service_account_file(
-            settings.GOOGLE_APPLICATION_CREDENTIALS,
-            scopes=['https://www.googleapis.com/auth/cloud-platform']
-        )
+        # Frames from the receive loop to the request generator; enqueue_frame() caps its length
+        audio_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+        processing_complete = asyncio.Event()
+        # Counters bumped by the receive loop and speech task, reported by log_stats()
+        stats = {"chunks_received": 0, "frames_sent": 0, "frames_dropped": 0, "responses": 0}
         
-        client = speech.SpeechClient(credentials=credentials)
-        
-        # Configure recognition (Speech V2 API)
-        # Note: AutoDetectDecodingConfig doesn't work well with WebM/Opus
-        # Frontend will send LINEAR16 PCM audio (16kHz, mono)
-        recognition_config = speech.RecognitionConfig(
-            explicit_decoding_config=speech.ExplicitDecodingConfig(
-                encoding=speech.ExplicitDecodingConfig.AudioEncoding.LINEAR16,
-                sample_rate_hertz=16000,  # Standard for speech recognition
-                audio_channel_count=1  # Mono
-            ),
-            language_codes=settings.GOOGLE_STT_ALTERNATE_LANGUAGES,  # All languages equal (hi-IN, mr-IN, en-IN)
-            model=settings.GOOGLE_STT_MODEL
-            # Note: Default recognizer (_) doesn't support advanced features like punctuation
-        )
-        print(f"📋 Recognition config: LINEAR16 @ 16kHz, model={settings.GOOGLE_STT_MODEL}, languages={settings.GOOGLE_STT_ALTERNATE_LANGUAGES}")
-        
-        streaming_config = speech.StreamingRecognitionConfig(
-            config=recognition_config,
-            streaming_features=speech.StreamingRecognitionFeatures(
-                interim_results=settings.GOOGLE_STT_INTERIM_RESULTS
-            )
-        )
-        
-        # Use a queue to bridge async WebSocket and sync Speech API
-        import queue
-        import threading
-        
-        audio_queue = queue.Queue()
-        processing_complete = threading.Event()
-        loop = asyncio.get_event_loop()  # Get event loop before threading
-        
-        # Audio stream generator (synchronous)
-        def audio_stream_generator():
+        async def audio_stream_generator():
             # Send config first
-            # Note: Speech V2 API requires 'global' location for streaming recognition
-            print(f"🎤 Starting audio stream generator for session {session_id}")
-            yield speech.StreamingRecognizeRequest(
-                recognizer=f"projects/{settings.GOOGLE_CLOUD_PROJECT}/locations/global/recognizers/_",
-                streaming_config=streaming_config
-            )
-            print(f"✅ Config request sent to Vertex AI")
+            logger.debug("Starting audio stream generator for session %s", session_id)
+            yield config_request
+            logger.debug("Config request sent to Vertex AI")
             
             # Then stream audio from queue
-            chunk_count = 0
             empty_count = 0
             max_empty_before_warn = 120  # Allow 2 minutes of silence before warning
+            last_sent = time.monotonic()
             while not processing_complete.is_set():
                 try:
-                    audio_chunk = audio_queue.get(timeout=0.5)  # Shorter timeout for faster response
-                    if audio_chunk is None:  # Sentinel value to stop
-                        print(f"📊 Audio stream ended (sentinel received). Total chunks sent: {chunk_count}")
-                        break
-                    if len(audio_chunk) > 0:
-                        chunk_count += 1
-                        empty_count = 0  # Reset empty counter
-                        if chunk_count % 40 == 0:  # Log every 40 chunks (~10 seconds)
-                            print(f"🎵 Sent {chunk_count} audio chunks ({len(audio_chunk)} bytes each)")
-                        yield speech.StreamingRecognizeRequest(audio=audio_chunk)
-                except queue.Empty:
+                    audio_chunk = await asyncio.wait_for(audio_queue.get(), timeout=0.5)
+                except asyncio.TimeoutError:
                     empty_count += 1
                     if empty_count >= max_empty_before_warn:
-                        print(f"⚠️  No audio received for {empty_count * 0.5:.1f} seconds! Check frontend audio capture.")
+                        logger.warning("No audio received for %.1f seconds on session %s; check frontend audio capture", empty_count * 0.5, session_id)
                         # Don't break - keep waiting for audio
+                    if time.monotonic() - last_sent >= STT_TRANSCRIBE_KEEPALIVE_SECONDS:
+                        last_sent = time.monotonic()
+                        yield silence_request  # Keep the stream open through the pause
                     continue
+                if audio_chunk is None:  # Sentinel value to stop
+                    logger.debug("Audio stream ended (sentinel received). Total frames sent: %d", stats["frames_sent"])
+                    break
+                stats["frames_sent"] += 1
+                empty_count = 0  # Reset empty counter
+                last_sent = time.monotonic()
+                yield speech.StreamingRecognizeRequest(audio=audio_chunk)
             
-            print(f"🛑 Generator exiting: processing_complete={processing_complete.is_set()}, chunks_sent={chunk_count}")
+            logger.debug("Generator exiting: processing_complete=%s, frames_sent=%d", processing_complete.is_set(), stats["frames_sent"])
         
-        # Process responses in a separate thread
+        # Drive Speech API streams on the event loop
         # NOTE: Keep processing until explicitly stopped (processing_complete is set)
-        def process_speech_responses():
-            response_count = 0
+        async def process_speech_responses():
             stream_count = 0
+            backoff = STT_RETRY_BACKOFF_MIN
             
             while not processing_complete.is_set():
                 stream_count += 1
+                responses = None
                 try:
-                    print(f"🚀 Starting Speech API stream #{stream_count} for session {session_id}")
-                    responses = client.streaming_recognize(requests=audio_stream_generator())
-                    print(f"✅ Speech API stream established, waiting for responses...")
+                    logger.info("Starting Speech API stream #%d for session %s", stream_count, session_id)
+                    responses = await client.streaming_recognize(requests=audio_stream_generator())
+                    logger.debug("Speech API stream established, waiting for responses")
                     
                     response_received = False
-                    for response in responses:
-                        response_received = True
+                    async for response in responses:
+                        if not response_received:
+                            response_received = True
+                            backoff = STT_RETRY_BACKOFF_MIN  # The stream is healthy again
                         if processing_complete.is_set():
-                            print(f"⏹️  Stop signal received, ending Speech API stream")
+                            logger.debug("Stop signal received, ending Speech API stream")
                             break
                             
-                        response_count += 1
-                        if response_count % 10 == 0:
-                            print(f"📥 Received {response_count} responses from Vertex AI")
+                        stats["responses"] += 1
                         
                         for result in response.results:
-                            if not result.alternatives:
+                            # Each proto-plus field access builds a wrapper, so read every field once
+                            alternatives = result.alternatives
+                            if not alternatives:
                                 continue
                             
-                            alternative = result.alternatives[0]
-                            transcript = alternative.transcript
-                            confidence = alternative.confidence if result.is_final else 0.0
+                            alternative = alternatives[0]
+                            is_final = result.is_final
+                            payload = {
+                                "transcript": alternative.transcript,
+                                "is_final": is_final,
+                                # The API only sets confidence on final results; interims read 0.0
+                                "confidence": alternative.confidence,
+                                "language_code": result.language_code,
+                                "timestamp": _utc_now_iso()
+                            }
                             
-                            # Send result to client (schedule in event loop)
-                            asyncio.run_coroutine_threadsafe(
-                                websocket.send_json({
-                                    "transcript": transcript,
-                                    "is_final": result.is_final,
-                                    "confidence": confidence,
-                                    "language_code": result.language_code,
-                                    "timestamp": datetime.now(timezone.utc).isoformat()
-                                }),
-                                loop
-                            )
+                            # Hand the result to the sender task
+                            outbound.put_nowait(payload)
                             
-                            if result.is_final:
-                                print(f"✅ FINAL transcript: {transcript[:100]}..." if len(transcript) > 100 else f"✅ FINAL transcript: {transcript}")
-                                print(f"   Confidence: {confidence:.2f}, Language: {result.language_code}")
+                            if is_final:
+                                logger.debug("FINAL transcript (confidence %.2f, %s): %.100s",
+                                             payload["confidence"], payload["language_code"], payload["transcript"])
                     
                     # Stream ended naturally (silence detected) - restart if not stopped
-                    print(f"📡 Stream #{stream_count} ended. Received responses: {response_received}, Total responses so far: {response_count}")
+                    logger.info("Stream #%d ended. Received responses: %s, total responses so far: %d",
+                                stream_count, response_received, stats["responses"])
                     
                     if not processing_complete.is_set():
-                        print(f"🔄 Speech API stream ended, restarting for continuous transcription...")
+                        logger.info("Speech API stream ended, restarting for continuous transcription")
                         continue  # Restart the loop
                     else:
-                        print(f"🏁 Speech API stream ended - session stopped (processing_complete is set)")
+                        logger.info("Speech API stream ended - session %s stopped", session_id)
                         break
                         
                 except Exception as e:
                     if processing_complete.is_set():
-                        print(f"ℹ️  Exception during shutdown (expected): {type(e).__name__}")
+                        logger.debug("Exception during shutdown (expected): %s", type(e).__name__)
                         break
                         
                     error_type = type(e).__name__
                     error_msg = str(e)
-                    print(f"❌ Speech processing error ({error_type}): {error_msg}")
+                    logger.error("Speech processing error (%s): %s", error_type, error_msg)
                     
                     # Handle timeout/aborted specifically - this might be recoverable
                     if "timed out" in error_msg.lower() or "aborted" in error_type.lower():
-                        print(f"⚠️  Speech API stream timed out (no audio received for ~40 seconds)")
-                        print(f"⚠️  This usually means the frontend stopped sending audio")
-                        print(f"⚠️  Check: 1) Audio capture still running? 2) WebSocket still sending data?")
+                        logger.warning("Speech API stream timed out for session %s (no audio for ~40 seconds); "
+                                       "the frontend has usually stopped sending audio", session_id)
                         if not processing_complete.is_set():
-                            print(f"🔄 Session still active - will retry when audio resumes...")
+                            logger.info("Session still active - will retry when audio resumes")
                             continue  # Try again - frontend might still be connected
                     
-                    import traceback
-                    print("Full traceback:")
-                    traceback.print_exc()
+                    logger.debug("Speech processing traceback", exc_info=True)
                     
                     # Send user-friendly error to client
-                    user_message = "Transcription service error. Please try again."
-                    if "credentials" in error_msg.lower():
-                        user_message = "Authentication error with speech service. Please contact support."
-                    elif "quota" in error_msg.lower():
-                        user_message = "Speech service quota exceeded. Please try again later."
-                    elif "network" in error_msg.lower() or "connection" in error_msg.lower():
-                        user_message = "Network error connecting to speech service. Please check your connection."
-                    elif "encoding" in error_msg.lower() or "format" in error_msg.lower():
-                        user_message = "Audio format error. Please try refreshing the page."
-                    
-                    asyncio.run_coroutine_threadsafe(
-                        websocket.send_json({
-                            "error": user_message,
-                            "detail": f"{error_type}: {error_msg[:200]}"  # Truncate long error messages
-                        }),
-                        loop
-                    )
+                    outbound.put_nowait({
+                        "error": _stt_error_user_message(error_msg),
+                        "detail": f"{error_type}: {error_msg[:200]}"  # Truncate long error messages
+                    })
                     
-                    # Wait a bit before retrying on error
+                    # Back off before retrying; the jitter spreads out sessions failing together
                     if not processing_complete.is_set():
-                        print(f"⏸️  Waiting 2 seconds before retry...")
-                        processing_complete.wait(timeout=2.0)
+                        delay = backoff + random.uniform(0, backoff / 2)
+                        logger.info("Retrying Speech API stream in %.2f seconds", delay)
+                        with contextlib.suppress(asyncio.TimeoutError):
+                            await asyncio.wait_for(processing_complete.wait(), timeout=delay)
+                        backoff = min(backoff * 2, STT_RETRY_BACKOFF_MAX)
+                finally:
+                    if responses is not None:
+                        responses.cancel()  # No-op once the call has finished
             
-            print(f"🧹 Speech processing thread cleanup for session {session_id} ({stream_count} streams processed)")
+            logger.info("Speech processing cleanup for session %s (%d streams processed)", session_id, stream_count)
             # NOTE: Don't set processing_complete here - let the WebSocket cleanup handle it
             # This allows the continuous transcription loop to work properly
         
-        # Start processing thread
-        processing_thread = threading.Thread(
-            target=process_speech_responses, 
-            daemon=True, 
-            name=f"Speech-{session_id}"
-        )
-        processing_thread.start()
-        print(f"✅ Speech processing thread started for session {session_id}")
+        # Results from the speech task go out through one sender task, in order. Whatever
+        # piled up during a send is drained at once, skipping interims a later result supersedes.
+        outbound: asyncio.Queue[dict] = asyncio.Queue()
+        
+        async def send_results():
+            try:
+                while True:
+                    batch = [await outbound.get()]
+                    while not outbound.empty():
+                        batch.append(outbound.get_nowait())
+                    for payload in _drop_superseded_interims(batch):
+                        await send_json_fast(websocket, payload)
+            except Exception as e:
+                # The socket closed under us; the receive loop notices and cleans up
+                logger.debug("Result sender stopped for session %s: %s", session_id, type(e).__name__)
+        
+        sender_task = asyncio.create_task(send_results())
+        
+        async def log_stats():
+            while True:
+                await asyncio.sleep(STT_STATS_LOG_INTERVAL)
+                logger.info("Session %s: %d chunks received, %d frames sent, %d frames dropped, %d responses",
+                            session_id, stats["chunks_received"], stats["frames_sent"],
+                            stats["frames_dropped"], stats["responses"])
+        
+        stats_task = asyncio.create_task(log_stats())
+        
+        speech_task = asyncio.create_task(process_speech_responses())
+        logger.info("Speech processing started for session %s", session_id)
         
         # Receive audio from WebSocket and put in queue
-        # NOTE: This loop runs independently of speech processing thread
+        # NOTE: This loop runs independently of the speech task
         # It only exits when WebSocket disconnects or errors occur
-        audio_chunks_received = 0
-        print(f"🎧 Starting WebSocket receive loop for session {session_id}")
+        # Small chunks are coalesced into frames (same thresholds as /ws/consultation) before
+        # reaching the request generator; a partial frame waits at most STT_FRAME_MAX_DELAY
+        pending = bytearray()
+        pending_since = 0.0
+        # Set while the speech stream lags and frames are being dropped; cleared at half capacity
+        overflowing = False
+        
+        def enqueue_frame(frame: bytes) -> None:
+            nonlocal overflowing
+            if audio_queue.qsize() >= STT_AUDIO_QUEUE_MAX_FRAMES:
+                audio_queue.get_nowait()  # Drop the oldest frame; the newest audio matters most
+                stats["frames_dropped"] += 1
+                if not overflowing:
+                    overflowing = True
+                    logger.warning("Audio queue full for session %s; dropping oldest frames", session_id)
+                    outbound.put_nowait({"type": "backpressure"})
+            elif overflowing and audio_queue.qsize() < STT_AUDIO_QUEUE_MAX_FRAMES // 2:
+                overflowing = False
+            audio_queue.put_nowait(frame)
+        # Only a partial frame needs a deadline; otherwise the loop just awaits the next message,
+        # so an idle socket costs nothing. A receive that outlives a deadline stays in flight here.
+        recv_task: Optional[asyncio.Task] = None
+        logger.debug("Starting WebSocket receive loop for session %s", session_id)
         try:
-            loop_iterations = 0
             while True:  # ✅ Keep receiving until WebSocket closes
-                loop_iterations += 1
-                if loop_iterations % 50 == 0:
-                    print(f"🔄 WebSocket loop iteration #{loop_iterations}, received {audio_chunks_received} chunks")
-                
-                try:
-                    audio_chunk = await asyncio.wait_for(
-                        websocket.receive_bytes(),
-                        timeout=1.0
+                if pending:
+                    if recv_task is None:
+                        recv_task = asyncio.create_task(websocket.receive_bytes())
+                    done, _ = await asyncio.wait(
+                        {recv_task},
+                        timeout=max(0.0, pending_since + STT_FRAME_MAX_DELAY - time.monotonic())
                     )
-                    if not audio_chunk or len(audio_chunk) == 0:
-                        print(f"⚠️  Received empty audio chunk, ignoring")
+                    if not done:
+                        # Partial frame hit its deadline
+                        enqueue_frame(bytes(pending))
+                        pending.clear()
                         continue
-                    
-                    audio_chunks_received += 1
-                    if audio_chunks_received % 40 == 0:  # Log every 40 chunks (~10 seconds)
-                        print(f"📨 Received {audio_chunks_received} audio chunks from frontend ({len(audio_chunk)} bytes each)")
-                    
-                    audio_queue.put(audio_chunk)
-                except asyncio.TimeoutError:
-                    # Normal timeout - check if we should continue
-                    if processing_complete.is_set():
-                        print(f"ℹ️  Speech thread stopped, ending receive loop (processing_complete is set)")
-                        break
-                    # Keep receiving
+                if recv_task is not None:
+                    task, recv_task = recv_task, None
+                    audio_chunk = await task
+                else:
+                    audio_chunk = await websocket.receive_bytes()
+                if not audio_chunk or len(audio_chunk) == 0:
+                    logger.debug("Received empty audio chunk, ignoring")
                     continue
-            
-            print(f"🛑 WebSocket receive loop exited normally after {loop_iterations} iterations")
+                
+                stats["chunks_received"] += 1
+                
+                if not pending and len(audio_chunk) >= STT_FRAME_MIN_BYTES:
+                    enqueue_frame(audio_chunk)  # Already a full frame; pass it through uncopied
+                    continue
+                if not pending:
+                    pending_since = time.monotonic()
+                pending += audio_chunk
+                if len(pending) >= STT_FRAME_MIN_BYTES or time.monotonic() - pending_since >= STT_FRAME_MAX_DELAY:
+                    enqueue_frame(bytes(pending))
+                    pending.clear()
         except WebSocketDisconnect:
-            print(f"🔌 WebSocket disconnected by client for session {session_id} after {loop_iterations} iterations")
+            logger.info("WebSocket disconnected by client for session %s", session_id)
         except Exception as e:
             error_type = type(e).__name__
-            print(f"❌ WebSocket receive error ({error_type}): {e}")
+            logger.error("WebSocket receive error (%s): %s", error_type, e)
         finally:
-            print(f"🧹 Cleaning up WebSocket connection for session {session_id}")
-            print(f"📊 Total audio chunks received: {audio_chunks_received}")
-            # Signal end of audio stream
-            audio_queue.put(None)
+            stats_task.cancel()
+            if recv_task is not None:
+                recv_task.cancel()
+            logger.info("Cleaning up WebSocket connection for session %s (%d audio chunks received)",
+                        session_id, stats["chunks_received"])
+            # Flush any partial frame, then signal end of audio stream
+            if pending:
+                audio_queue.put_nowait(bytes(pending))
+            audio_queue.put_nowait(None)
             processing_complete.set()
-            # Wait for speech thread to finish (with timeout)
-            print(f"⏳ Waiting for speech thread to finish...")
-            processing_thread.join(timeout=10.0)
-            if processing_thread.is_alive():
-                print(f"⚠️  Speech thread still running after timeout for session {session_id}")
-            else:
-                print(f"✅ Speech thread finished cleanly for session {session_id}")
-            print(f"🔌 WebSocket closed for session {session_id}")
+            # Let the speech task wind down; wait_for cancels it on timeout
+            logger.debug("Waiting for speech processing to finish")
+            try:
+                await asyncio.wait_for(speech_task, timeout=10.0)
+                logger.debug("Speech processing finished cleanly for session %s", session_id)
+            except asyncio.TimeoutError:
+                logger.warning("Speech processing still running after timeout for session %s; cancelled", session_id)
+            sender_task.cancel()
+            logger.debug("Receive loop cleanup done for session %s", session_id)
         
     except WebSocketDisconnect:
-        print(f"WebSocket disconnected for session {session_id}")
+        logger.info("WebSocket disconnected for session %s", session_id)
     except Exception as e:
-        print(f"WebSocket error: {str(e)}")
+        logger.error("WebSocket error for session %s: %s", session_id, e)
         try:
-            await websocket.send_json({
+            await send_json_fast(websocket, {
                 "error": str(e),
                 "detail": "Transcription error occurred"
             })
@@ -2466,4 +2961,4 @@ async def vertex_ai_transcribe_websocket(websocket: WebSocket):
                 await websocket.close()
         except:
             pass
-        print(f"WebSocket closed for session {session_id}")
+        logger.info("WebSocket closed for session %s", session_id)
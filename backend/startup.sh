@@ -8,4 +8,4 @@ sleep 5
 echo "Database is ready!"
 
 echo "Starting FastAPI application with PATIENT MANAGEMENT DEMO..."
-exec uvicorn simple_main:app --host 0.0.0.0 --port 8000 --reload
+exec uvicorn simple_main:app --host 0.0.0.0 --port 8000 --reload --loop uvloop --http httptools --ws-ping-interval 20 --ws-ping-timeout 20
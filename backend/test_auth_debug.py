@@ -8,8 +8,9 @@ from pathlib import Path
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import load_only, sessionmaker
 from app.models.user import User
 from app.core.encryption import HashingUtility
 from app.services.auth_service import AuthenticationService
@@ -18,11 +19,13 @@ import os
 
 async def test_authentication():
     """Test authentication flow."""
-    # Create sync engine for testing
-    sync_db_url = os.environ.get("DATABASE_URL", "").replace("+asyncpg", "")
-    engine = create_engine(sync_db_url)
-    SessionLocal = sessionmaker(bind=engine)
-    db = SessionLocal()
+    # Async engine on the native asyncpg driver for the lookups below, so their
+    # round trips yield to the event loop instead of blocking it
+    db_url = os.environ.get("DATABASE_URL", "")
+    async_db_url = db_url if "+asyncpg" in db_url else db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    async_engine = create_async_engine(async_db_url)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    db = AsyncSessionLocal()
     
     try:
         print("=" * 80)
@@ -31,10 +34,18 @@ async def test_authentication():
         
         # Test 1: Check if user exists
         print("\n1️⃣ Checking if users exist in database...")
-        users = db.query(User).all()
-        print(f"   Found {len(users)} users")
+        user_count = await db.scalar(select(func.count(User.id)))
+        print(f"   Found {user_count} users")
         
-        for user in users:
+        # Stream rows in chunks and select only the printed columns, so large
+        # users tables (and their encrypted columns) never load all at once
+        users = await db.stream_scalars(
+            select(User)
+            .options(load_only(User.id, User.email_hash, User.is_verified, User.is_active, User.password_hash))
+            .execution_options(yield_per=500)
+        )
+        
+        async for user in users:
             print(f"   - User ID: {user.id}")
             print(f"     Email Hash: {user.email_hash[:20]}...")
             print(f"     Is Verified: {user.is_verified}")
@@ -50,7 +61,12 @@ async def test_authentication():
         
         # Test 3: Find user by email_hash
         print("\n3️⃣ Looking up user by email_hash...")
-        user = db.query(User).filter(User.email_hash == email_hash).first()
+        # populate_existing: Test 1 may have left this user in the session with only some columns loaded
+        user = (await db.scalars(
+            select(User)
+            .where(User.email_hash == email_hash)
+            .execution_options(populate_existing=True)
+        )).first()
         
         if user:
             print(f"   ✅ User found!")
@@ -77,8 +93,12 @@ async def test_authentication():
         print(f"   Verification Result: {'✅ VALID' if is_valid else '❌ INVALID'}")
         
         # Test 5: Full authentication flow
+        # AuthenticationService is written against the sync Session API, so it still
+        # gets a sync session on the psycopg2 driver
         print("\n5️⃣ Testing full authentication flow...")
-        auth_service = AuthenticationService(db)
+        sync_engine = create_engine(db_url.replace("+asyncpg", ""))
+        sync_db = sessionmaker(bind=sync_engine)()
+        auth_service = AuthenticationService(sync_db)
         login_data = UserLogin(
             email=test_email,
             password=test_password,
@@ -104,13 +124,17 @@ async def test_authentication():
             print(f"   Error Type: {type(e).__name__}")
             import traceback
             traceback.print_exc()
+        finally:
+            sync_db.close()
+            sync_engine.dispose()
         
         print("\n" + "=" * 80)
         print("TEST COMPLETE")
         print("=" * 80)
         
     finally:
-        db.close()
+        await db.close()
+        await async_engine.dispose()
 
 if __name__ == "__main__":
     asyncio.run(test_authentication())
@@ -123,16 +123,13 @@ def main():
     print("STARTING EMAIL TESTS")
     print("=" * 60)
     
-    # Test approval email
-    approval_result = test_approval_email()
-    
-    # Wait a bit between emails
-    print("\nWaiting 2 seconds before next test...")
-    import time
-    time.sleep(2)
-    
-    # Test rejection email
-    rejection_result = test_rejection_email()
+    # Both emails go out over one SMTP connection, so no pause is needed between them
+    with email_service.session():
+        # Test approval email
+        approval_result = test_approval_email()
+        
+        # Test rejection email
+        rejection_result = test_rejection_email()
     
     # Summary
     print("\n" + "=" * 60)
@@ -5,9 +5,45 @@ Tests SMTP connection directly without importing the app
 
 import smtplib
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 from datetime import datetime
+from string import Template
+
+# Email body, parsed once; filled in with substitute() when the message is built
+HTML_TEMPLATE = Template("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body { font-family: Arial, sans-serif; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #50B9E8, #0A4D8B); color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 8px 8px; }
+            .success { color: #10B981; font-size: 48px; }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>✅ Email Test Successful!</h1>
+            </div>
+            <div class="content">
+                <div class="success">🎉</div>
+                <h2>Your email system is working!</h2>
+                <p><strong>Test Details:</strong></p>
+                <ul>
+                    <li>SMTP Host: ${smtp_host}</li>
+                    <li>SMTP Port: ${smtp_port}</li>
+                    <li>From: ${smtp_user}</li>
+                    <li>To: ${admin_email}</li>
+                    <li>Time: ${sent_at}</li>
+                </ul>
+                <p>Your demo request and contact forms will now send emails successfully!</p>
+            </div>
+        </div>
+    </body>
+    </html>
+""")
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -51,48 +87,20 @@ print()
 try:
     # Create message
     print("✓ Creating email message...")
-    msg = MIMEMultipart('alternative')
+    msg = EmailMessage()
     msg['Subject'] = "🎯 Test Email from SynapseAI"
     msg['From'] = f"SynapseAI <{SMTP_USER}>"
     msg['To'] = ADMIN_EMAIL
     
-    html_body = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #50B9E8, #0A4D8B); color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 8px 8px; }}
-            .success {{ color: #10B981; font-size: 48px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>✅ Email Test Successful!</h1>
-            </div>
-            <div class="content">
-                <div class="success">🎉</div>
-                <h2>Your email system is working!</h2>
-                <p><strong>Test Details:</strong></p>
-                <ul>
-                    <li>SMTP Host: {SMTP_HOST}</li>
-                    <li>SMTP Port: {SMTP_PORT}</li>
-                    <li>From: {SMTP_USER}</li>
-                    <li>To: {ADMIN_EMAIL}</li>
-                    <li>Time: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</li>
-                </ul>
-                <p>Your demo request and contact forms will now send emails successfully!</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    html_body = HTML_TEMPLATE.substitute(
+        smtp_host=SMTP_HOST,
+        smtp_port=SMTP_PORT,
+        smtp_user=SMTP_USER,
+        admin_email=ADMIN_EMAIL,
+        sent_at=datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+    )
     
-    part = MIMEText(html_body, 'html')
-    msg.attach(part)
+    msg.set_content(html_body, subtype='html')
     print("✓ Message created")
     
     # Connect to SMTP server
@@ -0,0 +1,37 @@
+"""
+Accept-Encoding negotiation for simple_main's precompressed patient list.
+"""
+import pytest
+
+from simple_main import _accepts_gzip
+
+
+class TestAcceptsGzip:
+    """gzip is sent only when the client allows it with a non-zero q-value"""
+
+    @pytest.mark.parametrize("header", [
+        "gzip",
+        "GZIP",
+        "gzip, deflate, br",
+        "br;q=1.0, gzip;q=0.8, *;q=0.1",
+        "gzip; q=0.5",
+        "x-gzip",
+        "*",
+        "deflate, *;q=0.5",
+    ])
+    def test_accepted(self, header):
+        assert _accepts_gzip(header) is True
+
+    @pytest.mark.parametrize("header", [
+        "",
+        "identity",
+        "br, deflate",
+        "gzip;q=0",
+        "gzip;q=0.000",
+        "GZip; Q=0",
+        "*;q=0",
+        "gzip;q=0, *",
+        "gzip;q=abc",
+    ])
+    def test_rejected(self, header):
+        assert _accepts_gzip(header) is False
@@ -167,8 +167,8 @@ class TestPasswordSecurity:
         
         # Verify password is not stored in plaintext
         assert user.password_hash != plain_password
-        # Verify it's a bcrypt hash (starts with $2b$)
-        assert user.password_hash.startswith("$2b$")
+        # Verify it's an Argon2id hash (starts with $argon2id$)
+        assert user.password_hash.startswith("$argon2id$")
     
     def test_password_verification_works(self):
         """Test that password verification correctly validates passwords"""
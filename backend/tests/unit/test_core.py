@@ -20,8 +20,8 @@ class TestPasswordHashing:
         
         # Password should be hashed
         assert hashed != password
-        # Should be a bcrypt hash
-        assert hashed.startswith("$2b$")
+        # Should be an Argon2id hash
+        assert hashed.startswith("$argon2id$")
         # Should be long enough
         assert len(hashed) > 50
     
@@ -51,6 +51,19 @@ class TestPasswordHashing:
         # But both should verify
         assert HashingUtility.verify_password(password, hash1)
         assert HashingUtility.verify_password(password, hash2)
+    
+    def test_legacy_bcrypt_hash_verifies_and_needs_rehash(self):
+        """Test that bcrypt hashes from before Argon2id still verify and get flagged for upgrade"""
+        import bcrypt
+        from app.core.encryption import HashingUtility
+        
+        password = "LegacyPassword123!"
+        legacy_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
+        
+        assert HashingUtility.verify_password(password, legacy_hash) is True
+        assert HashingUtility.verify_password("WrongPassword", legacy_hash) is False
+        assert HashingUtility.needs_rehash(legacy_hash) is True
+        assert HashingUtility.needs_rehash(HashingUtility.hash_password(password)) is False
 
 
 class TestDatabaseSetup:
@@ -0,0 +1,94 @@
+"""
+Prefix-narrowing tests for simple_main's intake symptom search.
+
+_search_intake narrows a query to the matches of a recent query it extends
+(_RECENT_INTAKE_MATCHES). Narrowing must never change the results.
+"""
+import pytest
+
+import simple_main
+
+LIMIT = 1000
+
+
+def typeahead(query: str) -> list[str]:
+    """The normalised terms the endpoint sees while `query` is typed one character at a time."""
+    terms = []
+    for end in range(1, len(query) + 1):
+        term = query[:end].lower().strip()
+        if term and (not terms or terms[-1] != term):
+            terms.append(term)
+    return terms
+
+
+def search_unnarrowed(term: str):
+    """Results with no recent matches to narrow from."""
+    simple_main._RECENT_INTAKE_MATCHES.clear()
+    try:
+        return simple_main._search_intake.__wrapped__(term, LIMIT)
+    finally:
+        simple_main._RECENT_INTAKE_MATCHES.clear()
+
+
+def search_after(terms: list[str]):
+    """Results for the last term after searching every earlier one, as typeahead does."""
+    simple_main._RECENT_INTAKE_MATCHES.clear()
+    try:
+        for term in terms[:-1]:
+            simple_main._search_intake.__wrapped__(term, LIMIT)
+        return simple_main._search_intake.__wrapped__(terms[-1], LIMIT)
+    finally:
+        simple_main._RECENT_INTAKE_MATCHES.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_recent_matches():
+    simple_main._RECENT_INTAKE_MATCHES.clear()
+    yield
+    simple_main._RECENT_INTAKE_MATCHES.clear()
+
+
+class TestPrefixNarrowing:
+    """Narrowed and unnarrowed searches must agree"""
+
+    @pytest.mark.parametrize("sequence", [
+        ["an", "anx"],
+        ["an", "anx", "anx dep"],
+        ["anx", "anx d", "anx dep"],
+        ["low e", "low energy"],
+        ["low", "low e", "low energy"],
+        ["lo", "low en"],
+        ["sl", "sleep p"],
+        ["dis", "dis o", "dis ord"],
+        ["de", "dep dis"],
+    ])
+    def test_explicit_sequences(self, sequence):
+        """Hand-picked sequences, including ones whose earlier term has a word of 2 chars or fewer"""
+        assert search_after(sequence) == search_unnarrowed(sequence[-1])
+
+    @pytest.mark.parametrize("query", [
+        "anx dep",
+        "anx dis",
+        "dep dis",
+        "dis ord",
+        "low energy",
+        "los inter",
+        "sexual dys",
+        "stress dis",
+        "use dis",
+    ])
+    def test_every_typeahead_step(self, query):
+        """Every intermediate term of a typed query, each narrowed by the terms before it"""
+        terms = typeahead(query)
+        for end in range(1, len(terms) + 1):
+            assert search_after(terms[:end]) == search_unnarrowed(terms[end - 1]), terms[:end]
+
+    def test_short_word_terms_do_not_narrow(self):
+        """'low e' has a 1-char word, so it skipped the word fallback and must not narrow 'low energy'"""
+        simple_main._search_intake.__wrapped__("low e", LIMIT)
+        assert simple_main._prefix_candidates("low energy") is None
+
+    def test_single_word_terms_narrow(self):
+        """'an' is a single word, so 'anx' is narrowed to its matches"""
+        simple_main._search_intake.__wrapped__("an", LIMIT)
+        assert simple_main._prefix_candidates("anx") is not None
@@ -0,0 +1,67 @@
+"""
+Tests for simple_main's SQLite-backed report store.
+
+_create_report/_update_report/_get_report replaced the old in-memory dict;
+the payload must round-trip exactly as the API returns it.
+"""
+import pytest
+
+import simple_main
+from simple_main import _create_report, _get_report, _get_report_status, _update_report
+
+
+class TestReportStore:
+    """Create, update and read back report rows"""
+
+    def test_create_assigns_increasing_ids(self):
+        """Ids come from AUTOINCREMENT and are never reused"""
+        first = _create_report({"session_id": "s-1", "status": "processing"})
+        second = _create_report({"session_id": "s-2", "status": "processing"})
+        assert second > first
+
+    def test_created_payload_includes_id_and_fields(self):
+        """The stored payload is the fields plus the new id"""
+        fields = {
+            "session_id": "s-create",
+            "status": "processing",
+            "created_at": "2024-01-01T00:00:00Z",
+        }
+        report_id = _create_report(fields)
+        assert _get_report(report_id) == {"id": report_id, **fields}
+        assert _get_report_status(report_id) == "processing"
+
+    def test_update_merges_fields_and_status(self):
+        """Updates merge into the payload and keep the status column in sync"""
+        report_id = _create_report({"session_id": "s-update", "status": "processing"})
+        _update_report(report_id, {
+            "status": "completed",
+            "report_content": "## CHIEF COMPLAINT\nAnxiety",
+            "highlight_tags": ["anxiety", "insomnia"],
+            "complaint_capture_score": {"score": 85, "rationale": "Covers both complaints"},
+        })
+        report = _get_report(report_id)
+        assert report["session_id"] == "s-update"
+        assert report["status"] == "completed"
+        assert report["highlight_tags"] == ["anxiety", "insomnia"]
+        assert report["complaint_capture_score"] == {"score": 85, "rationale": "Covers both complaints"}
+        assert _get_report_status(report_id) == "completed"
+
+    def test_unicode_payload_round_trips(self):
+        """Hindi transcripts and symbols survive the JSON column"""
+        report_id = _create_report({"session_id": "s-unicode", "status": "processing"})
+        _update_report(report_id, {"report_content": "मरीज़ को नींद नहीं आती — insomnia ✓"})
+        assert _get_report(report_id)["report_content"] == "मरीज़ को नींद नहीं आती — insomnia ✓"
+
+    def test_missing_report(self):
+        """Unknown ids read as None and updating them is a no-op"""
+        missing_id = 10 ** 9
+        _update_report(missing_id, {"status": "completed"})
+        assert _get_report(missing_id) is None
+        assert _get_report_status(missing_id) is None
+
+    def test_in_memory_store_keeps_memory_journal(self):
+        """The default in-memory database is not switched to WAL"""
+        if "mode=memory" not in simple_main.REPORTS_DB_URI:
+            pytest.skip("REPORTS_DB_URI points at a file database")
+        mode = simple_main._reports_db.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "memory"
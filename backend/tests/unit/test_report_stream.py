@@ -0,0 +1,66 @@
+"""
+Tests for simple_main's streamed report generation.
+
+Gemini streams can end with chunks that carry no parts (finish_reason or
+usage only, safety stops); their `.text` raises ValueError.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import google.ai.generativelanguage as glm
+from google.generativeai.types import generation_types
+
+import simple_main
+
+
+def make_chunk(data: dict):
+    return generation_types.GenerateContentResponse.from_response(glm.GenerateContentResponse(data))
+
+
+TEXT_CHUNKS = [
+    make_chunk({"candidates": [{"content": {"parts": [{"text": '{"generated_report": '}]}}]}),
+    make_chunk({"candidates": [{"content": {"parts": [{"text": '"ok"}'}]}}]}),
+]
+FINISH_ONLY_CHUNK = make_chunk({"candidates": [{"finish_reason": 1}], "usage_metadata": {"total_token_count": 12}})
+USAGE_ONLY_CHUNK = make_chunk({"usage_metadata": {"total_token_count": 12}})
+
+
+class FakeModel:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        async def stream_chunks():
+            for chunk in self.chunks:
+                yield chunk
+        return stream_chunks()
+
+
+class TestChunkText:
+    """_chunk_text reads text parts and tolerates part-less chunks"""
+
+    def test_text_chunk(self):
+        assert simple_main._chunk_text(TEXT_CHUNKS[0]) == '{"generated_report": '
+
+    def test_partless_chunks_give_empty_text(self):
+        assert simple_main._chunk_text(FINISH_ONLY_CHUNK) == ""
+        assert simple_main._chunk_text(USAGE_ONLY_CHUNK) == ""
+
+
+class TestStreamReportText:
+    """A trailing part-less chunk must not fail the whole report"""
+
+    def test_trailing_finish_and_usage_chunks(self, monkeypatch):
+        model = FakeModel([*TEXT_CHUNKS, FINISH_ONLY_CHUNK, USAGE_ONLY_CHUNK])
+        monkeypatch.setattr(simple_main, "gemini_service", SimpleNamespace(model=model))
+
+        async def run():
+            # Fresh semaphore bound to this test's event loop
+            monkeypatch.setattr(simple_main, "GEMINI_SEMAPHORE", asyncio.Semaphore(1))
+            return await simple_main._stream_report_text(-1, "prompt")
+
+        try:
+            assert asyncio.run(run()) == '{"generated_report": "ok"}'
+            assert simple_main._REPORT_PROGRESS[-1] == len('{"generated_report": "ok"}')
+        finally:
+            simple_main._REPORT_PROGRESS.pop(-1, None)
@@ -0,0 +1,116 @@
+"""
+Typo matching tests for simple_main's symptom search.
+
+Checks the bit-parallel Indel distance against a plain dynamic-programming
+implementation, and the BK-tree against a brute-force scan.
+"""
+import random
+
+import pytest
+
+import simple_main
+from simple_main import _BKTree, _indel_distance
+
+
+def naive_indel_distance(a: str, b: str) -> int:
+    """Insert/delete edit distance by the textbook DP table."""
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            if a[i - 1] == b[j - 1]:
+                cur[j] = prev[j - 1]
+            else:
+                cur[j] = min(prev[j], cur[j - 1]) + 1
+        prev = cur
+    return prev[len(b)]
+
+
+def random_word(rng: random.Random, alphabet: str, max_len: int) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len)))
+
+
+class TestIndelDistance:
+    """_indel_distance must agree with the DP definition"""
+
+    @pytest.mark.parametrize("alphabet", ["ab", "abcd", "abcdefghijklmnopqrstuvwxyz "])
+    def test_matches_naive_on_random_strings(self, alphabet):
+        """Small alphabets force many repeated characters, large ones many mismatches"""
+        rng = random.Random(alphabet)
+        for _ in range(2000):
+            a = random_word(rng, alphabet, 20)
+            b = random_word(rng, alphabet, 20)
+            assert _indel_distance(a, b) == naive_indel_distance(a, b), (a, b)
+
+    def test_matches_naive_beyond_machine_word(self):
+        """Strings longer than 64 chars exercise the arbitrary-precision bit rows"""
+        rng = random.Random(64)
+        for _ in range(200):
+            a = random_word(rng, "abc", 150)
+            b = random_word(rng, "abc", 150)
+            assert _indel_distance(a, b) == naive_indel_distance(a, b), (a, b)
+
+    def test_agrees_with_rapidfuzz(self):
+        """The BK-tree uses rapidfuzz's Indel when installed; both must give the same distances"""
+        if simple_main.rf_indel is None:
+            pytest.skip("rapidfuzz not installed")
+        rng = random.Random(7)
+        for _ in range(1000):
+            a = random_word(rng, "abcde ", 25)
+            b = random_word(rng, "abcde ", 25)
+            assert _indel_distance(a, b) == simple_main.rf_indel.distance(a, b), (a, b)
+
+    def test_edge_cases(self):
+        """Empty strings and identical strings"""
+        assert _indel_distance("", "") == 0
+        assert _indel_distance("", "abc") == 3
+        assert _indel_distance("abc", "") == 3
+        assert _indel_distance("anxiety", "anxiety") == 0
+        assert _indel_distance("anxiety", "anxeity") == 2
+
+
+class TestBKTree:
+    """_BKTree.find must return exactly what a linear scan finds"""
+
+    def brute_force(self, words, word, radius):
+        found = []
+        for index, candidate in enumerate(words):
+            d = _indel_distance(word, candidate)
+            if d <= radius:
+                found.append((index, d))
+        return sorted(found)
+
+    def test_matches_brute_force_on_random_words(self):
+        """Random words and queries at the radius the search uses (len(term) // 2)"""
+        rng = random.Random(19)
+        words = [random_word(rng, "abcdef", 10) for _ in range(300)]
+        tree = _BKTree(_indel_distance, words)
+        for _ in range(300):
+            query = random_word(rng, "abcdef", 10)
+            radius = len(query) // 2
+            assert sorted(tree.find(query, radius)) == self.brute_force(words, query, radius), query
+
+    def test_matches_brute_force_on_symptom_catalogue(self):
+        """Typos against the real symptom names, searched the same way as the typo matcher"""
+        words = [entry[0] for entry in simple_main._SYMPTOM_INDEX]
+        tree = _BKTree(_indel_distance, words)
+        rng = random.Random(52)
+        queries = ["anxeity", "insomina", "fatige", "hedache", "depresion", "panik", "xyz"]
+        for _ in range(100):
+            name = rng.choice(words)
+            chars = list(name)
+            if chars:
+                del chars[rng.randrange(len(chars))]
+            queries.append("".join(chars))
+        for query in queries:
+            radius = len(query) // 2
+            assert sorted(tree.find(query, radius)) == self.brute_force(words, query, radius), query
+
+    def test_duplicate_words_are_all_returned(self):
+        """Duplicates sit at edge distance 0 and must still be found"""
+        tree = _BKTree(_indel_distance, ["pain", "pain", "gain", "rain"])
+        assert sorted(tree.find("pain", 0)) == [(0, 0), (1, 0)]
+
+    def test_empty_tree(self):
+        """A tree built from no words finds nothing"""
+        assert _BKTree(_indel_distance, ()).find("anything", 5) == []